@@ -1,12 +1,31 @@
 import os
+import copy
+import hashlib
 import logging
-import json
-from langchain.chains import LLMChain
+import orjson
+import time
+import atexit
+import asyncio
+import threading
+import httpx
+import openai
+import requests
+from tenacity import retry, retry_if_exception_type, retry_if_not_exception_type, wait_random_exponential, stop_after_attempt, before_sleep_log
+from cachetools import TTLCache
+from openai import OpenAI
+from concurrent.futures import ThreadPoolExecutor
 from langchain.prompts import PromptTemplate
-from langchain_openai import ChatOpenAI
 from langchain_community.llms import Ollama
+from langchain_community.cache import SQLiteCache
+from langchain_core.globals import set_llm_cache
+from langchain_core.output_parsers import StrOutputParser
+from pydantic import ValidationError
+from app.core.schemas import ResumeData, JobAnalysis, OptimizedResume, SectionSuggestions
+from app.core.callbacks import usage_config
+from app.core.openai_chat import PooledChatOpenAI
+from app.core.semcache import semantic_cache_enabled, job_analysis_cache
 from app.database.vector_store import search_resume_data, search_job_descriptions
-from app.database.db_manager import get_session, User, Experience, Education, Skill
+from app.database.db_manager import get_user_bundle, get_user_updated_at
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +35,12 @@ MODEL_PROVIDER = os.getenv("MODEL_PROVIDER", "openai")  # 'openai' or 'ollama'
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "mistral")  # Default Ollama model
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")  # Default Ollama host
 
+# Smaller, faster OpenAI models for the extraction tasks, overridden by PARSE_MODEL and
+# ANALYZE_MODEL; optimization uses LLM_MODEL
+DEFAULT_PARSE_MODEL = "gpt-4o-mini"
+DEFAULT_ANALYZE_MODEL = "gpt-4o-mini"
+
+
 # List of available open source models for Ollama (models under 10B parameters)
 AVAILABLE_OLLAMA_MODELS = [
     "mistral",  # Mistral 7B
@@ -31,23 +56,377 @@ AVAILABLE_OLLAMA_MODELS = [
     "codellama",  # Code Llama, optimized for code
 ]
 
-def get_llm():
-    """Get LLM instance based on chosen provider."""
+def init_llm_cache():
+    """
+    Install a global LangChain cache so repeated prompts skip the LLM round trip.
+    
+    Called once at startup by initialize_model, so the settings are read after .env is loaded.
+    """
+    # LLM_CACHE is 'sqlite', 'redis' or 'none'
+    llm_cache = os.getenv("LLM_CACHE", "sqlite").lower()
+    
+    try:
+        if llm_cache == "redis":
+            import redis
+            from langchain_community.cache import RedisCache
+            redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+            set_llm_cache(RedisCache(redis_=redis.Redis.from_url(redis_url)))
+        elif llm_cache == "sqlite":
+            cache_path = os.getenv("LLM_CACHE_PATH", "data/.langchain_cache.db")
+            os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+            set_llm_cache(SQLiteCache(database_path=cache_path))
+        else:
+            return False
+        
+        logger.info("LLM response cache enabled (%s)", llm_cache)
+        return True
+    except Exception as e:
+        logger.error("Error initializing LLM cache: %s", e)
+        return False
+
+# Maximum number of concurrent LLM requests when processing several jobs at once
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "10"))
+
+# OpenAI Batch API settings for non-interactive optimization runs
+BATCH_COMPLETION_WINDOW = "24h"
+BATCH_POLL_INTERVAL = int(os.getenv("BATCH_POLL_INTERVAL", "60"))  # Seconds between status checks
+
+# Worker pool for LLM calls that can overlap with database work
+_executor = ThreadPoolExecutor(max_workers=4)
+
+# LLM instances keyed by (MODEL_PROVIDER, OpenAI model, OLLAMA_MODEL, OLLAMA_HOST, temperature, json_mode,
+# OpenAI API key digest, uses OPTIMIZE_TIMEOUT)
+_LLM_CACHE = {}
+
+# Resume data built from the database, keyed by (user_id, users.updated_at)
+_RESUME_CACHE = TTLCache(maxsize=1024, ttl=300)
+# cachetools caches are not thread-safe; Streamlit sessions and worker threads share this one
+_RESUME_CACHE_LOCK = threading.Lock()
+
+# Composed prompt | llm | parser chains keyed by (prompt id, llm id)
+_CHAIN_CACHE = {}
+
+# Connection pool settings shared by the sync and async OpenAI HTTP clients
+HTTP_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=50)
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+# Optimize calls return a whole rewritten resume and can legitimately take longer
+OPTIMIZE_TIMEOUT = httpx.Timeout(float(os.getenv("OPTIMIZE_TIMEOUT", "180")), connect=5.0)
+
+# Shared HTTP client so OpenAI requests reuse pooled connections
+_http_client = None
+
+def get_http_client():
+    """Get the shared httpx client used by the OpenAI LLM."""
+    global _http_client
+    
+    if _http_client is None:
+        _http_client = httpx.Client(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+    
+    return _http_client
+
+# Shared async HTTP client and the event loop it is bound to
+_async_http_client = None
+_async_loop = None
+_async_loop_lock = threading.Lock()
+
+def get_async_http_client():
+    """Get the shared httpx async client used by the OpenAI LLM."""
+    global _async_http_client
+    
+    if _async_http_client is None:
+        _async_http_client = httpx.AsyncClient(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+    
+    return _async_http_client
+
+def get_event_loop():
+    """
+    Get the background event loop that runs the async API.
+    
+    The shared async HTTP client can only be used from one event loop, so every
+    coroutine is run on this long-lived loop instead of a new asyncio.run() loop.
+    """
+    global _async_loop
+    
+    with _async_loop_lock:
+        if _async_loop is None:
+            _async_loop = asyncio.new_event_loop()
+            threading.Thread(target=_async_loop.run_forever, daemon=True).start()
+    
+    return _async_loop
+
+def run_async(coro):
+    """
+    Run a coroutine from synchronous code and wait for its result.
+    
+    Args:
+        coro: Coroutine, e.g. aparse_resume(...)
+        
+    Returns:
+        The coroutine's result
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop()).result()
+
+@atexit.register
+def close_http_clients():
+    """Close the shared HTTP clients at interpreter exit."""
+    if _http_client is not None:
+        _http_client.close()
+    
+    if _async_http_client is not None and _async_loop is not None:
+        try:
+            run_async(_async_http_client.aclose())
+        except Exception as e:
+            logger.debug("Error closing async HTTP client: %s", e)
+
+def get_openai_model(task="optimize"):
+    """
+    Get the OpenAI model used for a task.
+    
+    Args:
+        task (str, optional): 'parse', 'analyze' or 'optimize'
+        
+    Returns:
+        str: OpenAI model name
+    """
+    # Read on each call so the value from .env is used whenever it was loaded
+    if task == "parse":
+        return os.getenv("PARSE_MODEL", DEFAULT_PARSE_MODEL)
+    if task == "analyze":
+        return os.getenv("ANALYZE_MODEL", DEFAULT_ANALYZE_MODEL)
+    return LLM_MODEL
+
+def get_llm(temperature=0.2, task="optimize", json_mode=False):
+    """
+    Get LLM instance based on chosen provider.
+    
+    Args:
+        temperature (float, optional): Sampling temperature for the model
+        task (str, optional): 'parse', 'analyze' or 'optimize'; selects the OpenAI model
+        json_mode (bool, optional): Constrain the model to respond with a JSON object
+        
+    Returns:
+        LLM instance for the current provider
+    """
+    openai_model = get_openai_model(task)
+    # The key can be changed on the Settings page; hashed so it is not kept in the cache key
+    api_key_digest = hashlib.sha256(os.getenv("OPENAI_API_KEY", "").encode()).hexdigest()
+    # Part of the key so optimize never shares an instance (and its timeout) with another task
+    # that resolves to the same model
+    long_timeout = task == "optimize"
+    key = (MODEL_PROVIDER, openai_model, OLLAMA_MODEL, OLLAMA_HOST, temperature, json_mode, api_key_digest, long_timeout)
+    llm = _LLM_CACHE.get(key)
+    if llm is not None:
+        return llm
+    
     try:
         if MODEL_PROVIDER.lower() == "ollama":
             # Use Ollama for open source models
-            return Ollama(
+            llm = Ollama(
                 model=OLLAMA_MODEL,
                 base_url=OLLAMA_HOST,
-                temperature=0.2
+                temperature=temperature,
+                format="json" if json_mode else None
             )
         else:
-            # Use OpenAI by default
-            return ChatOpenAI(model_name=LLM_MODEL, temperature=0.2)
+            # Use OpenAI by default; the subclass keeps the shared clients out of the cache key
+            llm = PooledChatOpenAI(
+                model_name=openai_model,
+                temperature=temperature,
+                http_client=get_http_client(),
+                http_async_client=get_async_http_client(),
+                # Passed explicitly; the OpenAI client would otherwise send requests without a timeout
+                timeout=OPTIMIZE_TIMEOUT if long_timeout else HTTP_TIMEOUT,
+                # Retries are handled by _llm_retry / with_retry only
+                max_retries=0,
+                model_kwargs={"response_format": {"type": "json_object"}} if json_mode else {}
+            )
+        
+        _LLM_CACHE[key] = llm
+        return llm
     except Exception as e:
-        logger.error(f"Error initializing LLM with provider {MODEL_PROVIDER}: {str(e)}")
+        logger.error("Error initializing LLM with provider %s: %s", MODEL_PROVIDER, e)
         raise
 
+def _get_chain(prompt, temperature=0.2, task="optimize"):
+    """
+    Get the composed chain for a prompt and the current LLM.
+    
+    Args:
+        prompt (PromptTemplate): Module-level prompt template
+        temperature (float, optional): Sampling temperature for the model
+        task (str, optional): 'parse', 'analyze' or 'optimize'; selects the OpenAI model
+        
+    Returns:
+        Runnable: Chain that returns the LLM response text
+    """
+    # Every module-level prompt asks for JSON, so use the provider's JSON mode
+    llm = get_llm(temperature, task, json_mode=True)
+    key = (id(prompt), id(llm))
+    chain = _CHAIN_CACHE.get(key)
+    if chain is None:
+        chain = prompt | llm | StrOutputParser()
+        _CHAIN_CACHE[key] = chain
+    
+    return chain
+
+# Transient provider errors worth retrying (OpenAI API and the Ollama HTTP server).
+# Once the retries are exhausted the public functions re-raise them rather than returning
+# an empty result, so the UI can tell "service unavailable" apart from "nothing parsed".
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+)
+
+# Read timeouts; not retried on optimize calls, where every attempt already waits OPTIMIZE_TIMEOUT
+TIMEOUT_ERRORS = (
+    openai.APITimeoutError,
+    requests.exceptions.ReadTimeout,
+)
+
+def _retry_policy(retry_condition):
+    """Exponential backoff with jitter; each retry is logged before sleeping."""
+    return retry(
+        retry=retry_condition,
+        wait=wait_random_exponential(min=1, max=30),
+        stop=stop_after_attempt(5),
+        before_sleep=before_sleep_log(logger, logging.WARNING),
+        reraise=True
+    )
+
+_llm_retry = _retry_policy(retry_if_exception_type(RETRYABLE_ERRORS))
+_optimize_retry = _retry_policy(
+    retry_if_exception_type(RETRYABLE_ERRORS) & retry_if_not_exception_type(TIMEOUT_ERRORS)
+)
+
+@_llm_retry
+def _invoke(chain, inputs, config=None):
+    """Invoke a chain, retrying transient LLM errors."""
+    return chain.invoke(inputs, config=config)
+
+@_llm_retry
+async def _ainvoke(chain, inputs, config=None):
+    """Invoke a chain asynchronously, retrying transient LLM errors."""
+    return await chain.ainvoke(inputs, config=config)
+
+@_optimize_retry
+def _invoke_optimize(chain, inputs, config=None):
+    """Invoke an optimize chain, retrying transient LLM errors other than timeouts."""
+    return chain.invoke(inputs, config=config)
+
+@_optimize_retry
+async def _ainvoke_optimize(chain, inputs, config=None):
+    """Invoke an optimize chain asynchronously, retrying transient LLM errors other than timeouts."""
+    return await chain.ainvoke(inputs, config=config)
+
+# Marks a stream that ended before yielding anything
+_STREAM_END = object()
+
+@_llm_retry
+def _open_stream(runnable, inputs, config=None):
+    """Start a stream and read its first chunk, retrying transient LLM errors."""
+    stream = iter(runnable.stream(inputs, config=config))
+    return next(stream, _STREAM_END), stream
+
+def _stream(runnable, inputs, config=None):
+    """
+    Stream a runnable, retrying transient LLM errors raised before the first chunk.
+    
+    Errors after output has been yielded are raised to the caller; retrying then would
+    repeat text the caller has already shown.
+    """
+    first, stream = _open_stream(runnable, inputs, config)
+    if first is _STREAM_END:
+        return
+    
+    yield first
+    yield from stream
+
+def _get_batch_chain(prompt, temperature=0.2, task="optimize"):
+    """Get a chain for batch calls that retries each transient failure on its own."""
+    return _get_chain(prompt, temperature, task).with_retry(
+        retry_if_exception_type=RETRYABLE_ERRORS,
+        wait_exponential_jitter=True,
+        stop_after_attempt=5
+    )
+
+def _extract_json(text):
+    """
+    Extract the outermost JSON object from an LLM response in a single scan.
+    
+    Args:
+        text (str): Raw LLM response, possibly wrapped in markdown fences or prose
+        
+    Returns:
+        str: The JSON object text (or the original text if no object is found)
+    """
+    start = text.find("{")
+    if start == -1:
+        return text
+    
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    
+    return text[start:]
+
+def _parse_response(result_text, schema):
+    """
+    Validate an LLM response against a schema.
+    
+    Args:
+        result_text (str): Raw LLM response text
+        schema (type): Pydantic model describing the expected JSON
+        
+    Returns:
+        dict: Parsed data containing only the fields present in the response
+    """
+    # JSON mode responses are a bare object; only scan for one inside other text
+    if not result_text.lstrip().startswith("{"):
+        result_text = _extract_json(result_text)
+    return schema.model_validate_json(result_text).model_dump(exclude_unset=True)
+
+def _strip_empty(data):
+    """
+    Recursively drop keys and items whose value is None, "", [] or {}.
+    
+    Args:
+        data: Dict, list or scalar value
+        
+    Returns:
+        The data without empty values
+    """
+    if isinstance(data, dict):
+        stripped = {key: _strip_empty(value) for key, value in data.items()}
+        return {key: value for key, value in stripped.items() if value not in (None, "", [], {})}
+    if isinstance(data, list):
+        stripped = [_strip_empty(item) for item in data]
+        return [item for item in stripped if item not in (None, "", [], {})]
+    return data
+
+def _to_prompt_json(data):
+    """Serialize data as compact JSON without empty fields to keep prompts short."""
+    return orjson.dumps(_strip_empty(data), default=str).decode()
+
 def list_available_models():
     """
     List available models for selection.
@@ -56,7 +435,7 @@ def list_available_models():
         dict: Dictionary with model providers and their models
     """
     return {
-        "openai": ["gpt-3.5-turbo", "gpt-4-turbo"],
+        "openai": ["gpt-3.5-turbo", "gpt-4o-mini", "gpt-4-turbo"],
         "ollama": AVAILABLE_OLLAMA_MODELS
     }
 
@@ -75,10 +454,17 @@ def set_model_provider(provider, model=None):
     
     try:
         if provider.lower() not in ["openai", "ollama"]:
-            logger.error(f"Invalid model provider: {provider}")
+            logger.error("Invalid model provider: %s", provider)
             return False
         
-        MODEL_PROVIDER = provider.lower()
+        provider = provider.lower()
+        
+        # Called on every Streamlit rerun; keep the cached LLMs and chains when nothing changed
+        current_model = LLM_MODEL if provider == "openai" else OLLAMA_MODEL
+        if provider == MODEL_PROVIDER and (not model or model == current_model):
+            return True
+        
+        MODEL_PROVIDER = provider
         
         if model:
             if MODEL_PROVIDER == "openai":
@@ -86,37 +472,28 @@ def set_model_provider(provider, model=None):
             else:  # ollama
                 OLLAMA_MODEL = model
         
-        # Test the model connection
+        # Drop instances built for the previous settings, then test the model connection
+        _LLM_CACHE.clear()
+        _CHAIN_CACHE.clear()
+        job_analysis_cache.clear()
         _ = get_llm()
         
-        logger.info(f"Set model provider to {MODEL_PROVIDER} with model {model if model else 'default'}")
+        logger.info("Set model provider to %s with model %s", MODEL_PROVIDER, model if model else 'default')
         return True
     except Exception as e:
-        logger.error(f"Error setting model provider: {str(e)}")
+        logger.error("Error setting model provider: %s", e)
         return False
 
-def parse_resume(resume_text):
-    """
-    Parse resume text and extract structured information.
-    
-    Args:
-        resume_text (str): Raw resume text
-        
-    Returns:
-        dict: Structured resume data
-    """
-    try:
-        llm = get_llm()
-        
-        prompt = PromptTemplate(
-            input_variables=["resume_text"],
-            template="""
+# Prompt for resume parsing
+PARSE_PROMPT = PromptTemplate(
+    input_variables=["resume_text"],
+    template="""
             You are an expert resume parser. Your task is to extract structured information from the following resume.
             Extract the information in JSON format with the following structure:
             
             ```json
-            {
-                "basic_info": {
+            {{
+                "basic_info": {{
                     "name": "",
                     "email": "",
                     "phone": "",
@@ -125,9 +502,9 @@ def parse_resume(resume_text):
                     "github": "",
                     "website": "",
                     "summary": ""
-                },
+                }},
                 "experiences": [
-                    {
+                    {{
                         "company": "",
                         "title": "",
                         "location": "",
@@ -135,10 +512,10 @@ def parse_resume(resume_text):
                         "end_date": "",
                         "description": "",
                         "achievements": []
-                    }
+                    }}
                 ],
                 "educations": [
-                    {
+                    {{
                         "institution": "",
                         "degree": "",
                         "field_of_study": "",
@@ -147,50 +524,50 @@ def parse_resume(resume_text):
                         "end_date": "",
                         "gpa": "",
                         "description": ""
-                    }
+                    }}
                 ],
                 "skills": [
-                    {
+                    {{
                         "name": "",
                         "category": "",
                         "proficiency": ""
-                    }
+                    }}
                 ],
                 "certifications": [
-                    {
+                    {{
                         "name": "",
                         "issuer": "",
                         "date": "",
                         "description": ""
-                    }
+                    }}
                 ],
                 "projects": [
-                    {
+                    {{
                         "name": "",
                         "description": "",
                         "technologies": "",
                         "url": "",
                         "start_date": "",
                         "end_date": ""
-                    }
+                    }}
                 ],
                 "publications": [
-                    {
+                    {{
                         "title": "",
                         "publisher": "",
                         "date": "",
                         "url": "",
                         "description": ""
-                    }
+                    }}
                 ],
                 "achievements": [
-                    {
+                    {{
                         "title": "",
                         "date": "",
                         "description": ""
-                    }
+                    }}
                 ]
-            }
+            }}
             ```
             
             Resume:
@@ -198,55 +575,48 @@ def parse_resume(resume_text):
             
             Respond ONLY with the JSON object. No other text before or after.
             """
-        )
+)
+
+def parse_resume(resume_text):
+    """
+    Parse resume text and extract structured information.
+    
+    Args:
+        resume_text (str): Raw resume text
         
-        chain = LLMChain(llm=llm, prompt=prompt)
-        result = chain.invoke({"resume_text": resume_text})
+    Returns:
+        dict: Structured resume data
+    """
+    try:
+        # Extraction is deterministic, so repeat inputs hit the LLM cache
+        chain = _get_chain(PARSE_PROMPT, temperature=0, task="parse")
+        result = _invoke(chain, {"resume_text": resume_text}, usage_config("parse_resume"))
         
         # Extract JSON from result
         try:
-            # Parse the JSON response
-            result_text = result.get('text', '')
-            # Extract the JSON part if there are other text markers
-            if '```json' in result_text:
-                json_str = result_text.split('```json')[1].split('```')[0].strip()
-            elif '```' in result_text:
-                json_str = result_text.split('```')[1].split('```')[0].strip()
-            else:
-                json_str = result_text
-            
-            parsed_data = json.loads(json_str)
+            parsed_data = _parse_response(result, ResumeData)
             return parsed_data
-        except json.JSONDecodeError as e:
-            logger.error(f"Error parsing JSON from LLM response: {str(e)}")
-            logger.error(f"Raw response: {result}")
+        except ValidationError as e:
+            logger.error("Error parsing JSON from LLM response: %s", e)
+            logger.error("Raw response: %s", result)
             return {}
             
+    except RETRYABLE_ERRORS:
+        # Still failing after the retries; re-raised so callers can tell it apart from an empty result
+        raise
     except Exception as e:
-        logger.error(f"Error parsing resume: {str(e)}")
+        logger.error("Error parsing resume: %s", e)
         return {}
 
-def analyze_job_description(job_desc_text):
-    """
-    Analyze job description and extract key requirements.
-    
-    Args:
-        job_desc_text (str): Raw job description text
-        
-    Returns:
-        dict: Structured job requirements
-    """
-    try:
-        llm = get_llm()
-        
-        prompt = PromptTemplate(
-            input_variables=["job_desc"],
-            template="""
+# Prompt for job description analysis
+ANALYZE_PROMPT = PromptTemplate(
+    input_variables=["job_desc"],
+    template="""
             You are an expert at analyzing job descriptions. Your task is to extract structured information from the following job description.
             Extract the information in JSON format with the following structure:
             
             ```json
-            {
+            {{
                 "job_title": "",
                 "company": "",
                 "required_skills": [],
@@ -255,7 +625,7 @@ def analyze_job_description(job_desc_text):
                 "required_education": "",
                 "job_responsibilities": [],
                 "keywords": []
-            }
+            }}
             ```
             
             Job Description:
@@ -263,122 +633,53 @@ def analyze_job_description(job_desc_text):
             
             Respond ONLY with the JSON object. No other text before or after.
             """
-        )
-        
-        chain = LLMChain(llm=llm, prompt=prompt)
-        result = chain.invoke({"job_desc": job_desc_text})
-        
-        # Extract JSON from result
-        try:
-            # Parse the JSON response
-            result_text = result.get('text', '')
-            # Extract the JSON part if there are other text markers
-            if '```json' in result_text:
-                json_str = result_text.split('```json')[1].split('```')[0].strip()
-            elif '```' in result_text:
-                json_str = result_text.split('```')[1].split('```')[0].strip()
-            else:
-                json_str = result_text
-            
-            parsed_data = json.loads(json_str)
-            return parsed_data
-        except json.JSONDecodeError as e:
-            logger.error(f"Error parsing JSON from LLM response: {str(e)}")
-            logger.error(f"Raw response: {result}")
-            return {}
-            
-    except Exception as e:
-        logger.error(f"Error analyzing job description: {str(e)}")
-        return {}
+)
 
-def optimize_resume_for_job(user_id, job_description, job_analysis=None):
+def analyze_job_description(job_desc_text):
     """
-    Optimize resume for a specific job.
+    Analyze job description and extract key requirements.
+    
+    With SEMANTIC_CACHE enabled, a near-identical job description (e.g. a re-post)
+    reuses the earlier analysis instead of calling the LLM.
     
     Args:
-        user_id (int): User ID
-        job_description (str): Raw job description text
-        job_analysis (dict, optional): Pre-analyzed job requirements
+        job_desc_text (str): Raw job description text
         
     Returns:
-        dict: Optimized resume data
+        dict: Structured job requirements
     """
+    if semantic_cache_enabled():
+        return job_analysis_cache.get_or_compute(job_desc_text, lambda: _analyze_job_description(job_desc_text))
+    
+    return _analyze_job_description(job_desc_text)
+
+def _analyze_job_description(job_desc_text):
+    """Analyze a job description with the LLM (see analyze_job_description)."""
     try:
-        # Get user data from database
-        session = get_session()
-        user = session.query(User).filter(User.id == user_id).first()
+        # Extraction is deterministic, so repeat inputs hit the LLM cache
+        chain = _get_chain(ANALYZE_PROMPT, temperature=0, task="analyze")
+        result = _invoke(chain, {"job_desc": job_desc_text}, usage_config("analyze_job_description"))
         
-        if not user:
-            logger.error(f"User {user_id} not found")
+        # Extract JSON from result
+        try:
+            parsed_data = _parse_response(result, JobAnalysis)
+            return parsed_data
+        except ValidationError as e:
+            logger.error("Error parsing JSON from LLM response: %s", e)
+            logger.error("Raw response: %s", result)
             return {}
-        
-        # Analyze job description if not already provided
-        if not job_analysis:
-            job_analysis = analyze_job_description(job_description)
-        
-        # Prepare resume data
-        resume_data = {
-            "basic_info": {
-                "name": user.name,
-                "email": user.email,
-                "phone": user.phone,
-                "address": user.address,
-                "linkedin": user.linkedin,
-                "github": user.github,
-                "website": user.website,
-                "summary": user.summary
-            },
-            "experiences": [],
-            "educations": [],
-            "skills": [],
-            "certifications": [],
-            "projects": [],
-            "publications": [],
-            "achievements": []
-        }
-        
-        # Fill in experiences
-        for exp in user.experiences:
-            resume_data["experiences"].append({
-                "company": exp.company,
-                "title": exp.title,
-                "location": exp.location,
-                "start_date": exp.start_date,
-                "end_date": exp.end_date,
-                "description": exp.description,
-                "achievements": exp.achievements.split("\n") if exp.achievements else []
-            })
-        
-        # Fill in educations
-        for edu in user.educations:
-            resume_data["educations"].append({
-                "institution": edu.institution,
-                "degree": edu.degree,
-                "field_of_study": edu.field_of_study,
-                "location": edu.location,
-                "start_date": edu.start_date,
-                "end_date": edu.end_date,
-                "gpa": edu.gpa,
-                "description": edu.description
-            })
-        
-        # Fill in skills
-        for skill in user.skills:
-            resume_data["skills"].append({
-                "name": skill.name,
-                "category": skill.category,
-                "proficiency": skill.proficiency
-            })
-        
-        # Fill in other sections similarly
-        # [Code for other sections omitted for brevity]
-        
-        # Optimize resume using LLM
-        llm = get_llm()
-        
-        prompt = PromptTemplate(
-            input_variables=["resume_data", "job_description", "job_analysis"],
-            template="""
+            
+    except RETRYABLE_ERRORS:
+        # Still failing after the retries; re-raised so callers can tell it apart from an empty result
+        raise
+    except Exception as e:
+        logger.error("Error analyzing job description: %s", e)
+        return {}
+
+# Prompt for resume optimization
+OPTIMIZE_PROMPT = PromptTemplate(
+    input_variables=["resume_data", "job_description", "job_analysis"],
+    template="""
             You are an expert resume optimizer. Your task is to optimize the resume for the specific job.
             
             Resume Data:
@@ -398,39 +699,613 @@ def optimize_resume_for_job(user_id, job_description, job_analysis=None):
             5. Making sure the resume is ATS-friendly
             6. Ensuring the resume is concise and fits on one page
             
+            Fields with no value have been omitted from the resume data and job analysis; do not invent them.
             Provide the optimized resume in JSON format with the same structure as the original resume data.
             Only include the most relevant and impressive achievements, skills, and experiences that align with the job requirements.
             
             Respond ONLY with the JSON object. No other text before or after.
             """
-        )
+)
+
+def _load_resume_data(user_id):
+    """
+    Load a user's resume data from the database.
+    
+    Args:
+        user_id (int): User ID
         
-        chain = LLMChain(llm=llm, prompt=prompt)
-        result = chain.invoke({
-            "resume_data": json.dumps(resume_data, indent=2),
-            "job_description": job_description,
-            "job_analysis": json.dumps(job_analysis, indent=2)
-        })
+    Returns:
+        dict: Resume data as a copy the caller may modify, or None if the user is not found
+    """
+    # updated_at changes on every write to the user or their sections
+    updated_at = get_user_updated_at(user_id)
+    key = (user_id, updated_at)
+    with _RESUME_CACHE_LOCK:
+        resume_data = _RESUME_CACHE.get(key)
+    if resume_data is not None:
+        return copy.deepcopy(resume_data)
+    
+    # Loaded outside the lock so one slow query does not block other users
+    resume_data = get_user_bundle(user_id)
+    if resume_data is None:
+        logger.error("User %s not found", user_id)
+        return None
+    
+    # Stored as a copy so later changes to the caller's result do not reach the cache
+    with _RESUME_CACHE_LOCK:
+        _RESUME_CACHE[key] = copy.deepcopy(resume_data)
+    return resume_data
+
+def _prepare_optimize_inputs(user_id, job_description, job_analysis=None):
+    """
+    Load the user's resume and job analysis and build the optimize prompt inputs.
+    
+    Args:
+        user_id (int): User ID
+        job_description (str): Raw job description text
+        job_analysis (dict, optional): Pre-analyzed job requirements
+        
+    Returns:
+        tuple: (resume_data, prompt inputs), or (None, None) if the user is not found
+    """
+    # Analyze job description in the background if not already provided
+    job_analysis_future = None
+    if not job_analysis:
+        job_analysis_future = _executor.submit(analyze_job_description, job_description)
+    
+    # Get resume data from database
+    resume_data = _load_resume_data(user_id)
+    if resume_data is None:
+        return None, None
+    
+    # Wait for the job analysis to finish
+    if job_analysis_future is not None:
+        job_analysis = job_analysis_future.result()
+    
+    inputs = {
+        "resume_data": _to_prompt_json(resume_data),
+        "job_description": job_description,
+        "job_analysis": _to_prompt_json(job_analysis)
+    }
+    return resume_data, inputs
+
+def optimize_resume_for_job(user_id, job_description, job_analysis=None):
+    """
+    Optimize resume for a specific job.
+    
+    Args:
+        user_id (int): User ID
+        job_description (str): Raw job description text
+        job_analysis (dict, optional): Pre-analyzed job requirements
+        
+    Returns:
+        dict: Optimized resume data
+    """
+    try:
+        resume_data, inputs = _prepare_optimize_inputs(user_id, job_description, job_analysis)
+        if resume_data is None:
+            return {}
+        
+        # Optimize resume using LLM
+        chain = _get_chain(OPTIMIZE_PROMPT)
+        result = _invoke_optimize(chain, inputs, usage_config("optimize_resume_for_job", user_id=user_id))
         
         # Extract JSON from result
         try:
-            # Parse the JSON response
-            result_text = result.get('text', '')
-            # Extract the JSON part if there are other text markers
-            if '```json' in result_text:
-                json_str = result_text.split('```json')[1].split('```')[0].strip()
-            elif '```' in result_text:
-                json_str = result_text.split('```')[1].split('```')[0].strip()
-            else:
-                json_str = result_text
-            
-            optimized_data = json.loads(json_str)
+            optimized_data = _parse_response(result, OptimizedResume)
             return optimized_data
-        except json.JSONDecodeError as e:
-            logger.error(f"Error parsing JSON from LLM response: {str(e)}")
-            logger.error(f"Raw response: {result}")
+        except ValidationError as e:
+            logger.error("Error parsing JSON from LLM response: %s", e)
+            logger.error("Raw response: %s", result)
+            return resume_data
+            
+    except RETRYABLE_ERRORS:
+        # Still failing after the retries; re-raised so callers can tell it apart from an empty result
+        raise
+    except Exception as e:
+        logger.error("Error optimizing resume: %s", e)
+        return {}
+
+def optimize_resume_for_job_stream(user_id, job_description, job_analysis=None):
+    """
+    Stream the optimized resume JSON for a specific job as it is generated.
+    
+    Args:
+        user_id (int): User ID
+        job_description (str): Raw job description text
+        job_analysis (dict, optional): Pre-analyzed job requirements
+        
+    Yields:
+        str: Chunks of the LLM response text
+    """
+    try:
+        resume_data, inputs = _prepare_optimize_inputs(user_id, job_description, job_analysis)
+        if resume_data is None:
+            return
+        
+        chain = _get_chain(OPTIMIZE_PROMPT)
+        for chunk in _stream(chain, inputs, usage_config("optimize_resume_for_job_stream", user_id=user_id)):
+            yield chunk
+            
+    except RETRYABLE_ERRORS:
+        # Still failing after the retries; re-raised so callers can tell it apart from an empty result
+        raise
+    except Exception as e:
+        logger.error("Error streaming optimized resume: %s", e)
+
+def parse_optimized_resume(response_text):
+    """
+    Parse a streamed optimize response into resume data.
+    
+    Args:
+        response_text (str): Full text collected from optimize_resume_for_job_stream
+        
+    Returns:
+        dict: Optimized resume data
+    """
+    try:
+        return _parse_response(response_text, OptimizedResume)
+    except ValidationError as e:
+        logger.error("Error parsing JSON from LLM response: %s", e)
+        logger.error("Raw response: %s", response_text)
+        return {}
+
+# Plain format string: the chat prompt is filled once per turn without building a PromptTemplate
+CHAT_PROMPT = """
+You are an AI resume assistant helping a user improve their resume.
+
+Here is the user's resume data:
+{resume_data}
+
+Chat history:
+{chat_history}
+
+The user's latest message is:
+{user_message}
+
+Provide a helpful response that helps the user improve their resume.
+If they ask for improvements, be specific about how they can enhance their resume.
+If they want to add or modify information, explain how to do that effectively.
+Be concise but thorough in your advice.
+"""
+
+def chat_about_resume_stream(resume_context, chat_history, user_message, user_id=None):
+    """
+    Stream a chat reply about the user's resume as it is generated.
+    
+    Args:
+        resume_context (str): Serialized resume data
+        chat_history (str): Previous messages formatted as "role: content" lines
+        user_message (str): The user's latest message
+        user_id (int, optional): User ID for usage logging
+        
+    Yields:
+        str: Chunks of the LLM response text
+    """
+    try:
+        prompt = CHAT_PROMPT.format(
+            resume_data=resume_context,
+            chat_history=chat_history,
+            user_message=user_message
+        )
+        
+        for chunk in _stream(get_llm(), prompt, usage_config("chat_about_resume_stream", user_id=user_id)):
+            # Chat models yield message chunks, completion models (Ollama) yield strings
+            yield getattr(chunk, "content", chunk)
+            
+    except RETRYABLE_ERRORS:
+        # Still failing after the retries; re-raised so callers can tell it apart from an empty result
+        raise
+    except Exception as e:
+        logger.error("Error generating chat response: %s", e)
+
+SUMMARY_PROMPT = """
+Summarize the following conversation between a user and an AI resume assistant in one short paragraph.
+Keep the user's goals, the changes they asked for and the advice they were given.
+
+Summary of the conversation so far:
+{summary}
+
+New messages:
+{messages}
+"""
+
+def summarize_chat_history(summary, messages, user_id=None):
+    """
+    Fold older chat messages into a running summary.
+    
+    Args:
+        summary (str): Summary of messages folded in earlier ("" if none)
+        messages (str): Messages to add, formatted as "role: content" lines
+        user_id (int, optional): User ID for usage logging
+        
+    Returns:
+        str: Updated summary, or the previous summary on error
+    """
+    try:
+        llm = get_llm(temperature=0, task="analyze")
+        result = _invoke(
+            llm,
+            SUMMARY_PROMPT.format(summary=summary or "(none)", messages=messages),
+            usage_config("summarize_chat_history", user_id=user_id)
+        )
+        return getattr(result, "content", result).strip()
+    except RETRYABLE_ERRORS:
+        # Still failing after the retries; re-raised so callers can tell it apart from an empty result
+        raise
+    except Exception as e:
+        logger.error("Error summarizing chat history: %s", e)
+        return summary
+
+def summarize_chat_history_async(summary, messages, user_id=None):
+    """
+    Run summarize_chat_history in the background.
+    
+    Returns:
+        Future: Resolves to the updated summary
+    """
+    return _executor.submit(summarize_chat_history, summary, messages, user_id)
+
+def optimize_resume_for_jobs(user_id, job_descriptions):
+    """
+    Optimize a resume for several jobs, sending the LLM requests concurrently.
+    
+    Args:
+        user_id (int): User ID
+        job_descriptions (list): Raw job description texts
+        
+    Returns:
+        list: Optimized resume data for each job, in the same order
+    """
+    try:
+        # Load the resume once for all jobs
+        resume_data = _load_resume_data(user_id)
+        if resume_data is None:
+            return [{} for _ in job_descriptions]
+        
+        resume_json = _to_prompt_json(resume_data)
+        
+        # Analyze all job descriptions in one batch
+        analyze_chain = _get_batch_chain(ANALYZE_PROMPT, temperature=0, task="analyze")
+        analyze_results = analyze_chain.batch(
+            [{"job_desc": job_description} for job_description in job_descriptions],
+            config={"max_concurrency": BATCH_MAX_CONCURRENCY, **usage_config("analyze_job_description")},
+            return_exceptions=True
+        )
+        
+        job_analyses = []
+        for result in analyze_results:
+            if isinstance(result, Exception):
+                logger.error("Error analyzing job description: %s", result)
+                job_analyses.append({})
+                continue
+            
+            try:
+                job_analyses.append(_parse_response(result, JobAnalysis))
+            except ValidationError as e:
+                logger.error("Error parsing JSON from LLM response: %s", e)
+                job_analyses.append({})
+        
+        # Optimize the resume against every job in one batch
+        optimize_chain = _get_batch_chain(OPTIMIZE_PROMPT)
+        optimize_results = optimize_chain.batch(
+            [
+                {
+                    "resume_data": resume_json,
+                    "job_description": job_description,
+                    "job_analysis": _to_prompt_json(job_analysis)
+                }
+                for job_description, job_analysis in zip(job_descriptions, job_analyses)
+            ],
+            config={"max_concurrency": BATCH_MAX_CONCURRENCY, **usage_config("optimize_resume_for_jobs", user_id=user_id)},
+            return_exceptions=True
+        )
+        
+        optimized_resumes = []
+        for result in optimize_results:
+            if isinstance(result, Exception):
+                logger.error("Error optimizing resume: %s", result)
+                optimized_resumes.append({})
+                continue
+            
+            try:
+                optimized_resumes.append(_parse_response(result, OptimizedResume))
+            except ValidationError as e:
+                logger.error("Error parsing JSON from LLM response: %s", e)
+                logger.error("Raw response: %s", result)
+                # Each fallback gets its own copy so editing one result does not change the others
+                optimized_resumes.append(copy.deepcopy(resume_data))
+        
+        return optimized_resumes
+        
+    except Exception as e:
+        logger.error("Error optimizing resume for jobs: %s", e)
+        return [{} for _ in job_descriptions]
+
+def submit_optimize_batch(optimize_requests):
+    """
+    Submit resume optimizations to the OpenAI Batch API.
+    
+    Batches are processed within 24 hours at half the cost of regular requests,
+    so this is meant for non-interactive runs such as re-optimizing saved jobs.
+    
+    Args:
+        optimize_requests (list): Dicts with 'user_id', 'job_description', optional
+            'job_analysis' and optional 'custom_id'
+        
+    Returns:
+        str: Batch ID, or None if the batch could not be created
+    """
+    try:
+        lines = []
+        for i, request in enumerate(optimize_requests):
+            resume_data, inputs = _prepare_optimize_inputs(
+                request["user_id"],
+                request["job_description"],
+                request.get("job_analysis")
+            )
+            if resume_data is None:
+                continue
+            
+            lines.append(orjson.dumps({
+                "custom_id": str(request.get("custom_id", i)),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": LLM_MODEL,
+                    "temperature": 0.2,
+                    "response_format": {"type": "json_object"},
+                    "messages": [{"role": "user", "content": OPTIMIZE_PROMPT.format(**inputs)}]
+                }
+            }))
+        
+        if not lines:
+            logger.error("No valid requests to submit in optimize batch")
+            return None
+        
+        client = OpenAI(http_client=get_http_client())
+        batch_file = client.files.create(
+            file=("optimize_batch.jsonl", b"\n".join(lines)),
+            purpose="batch"
+        )
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window=BATCH_COMPLETION_WINDOW
+        )
+        
+        logger.info("Submitted optimize batch %s with %s requests", batch.id, len(lines))
+        return batch.id
+        
+    except Exception as e:
+        logger.error("Error submitting optimize batch: %s", e)
+        return None
+
+def get_optimize_batch_results(batch_id, wait=True):
+    """
+    Retrieve the results of an optimize batch.
+    
+    Args:
+        batch_id (str): Batch ID returned by submit_optimize_batch
+        wait (bool, optional): Poll until the batch finishes instead of returning immediately
+        
+    Returns:
+        dict: Optimized resume data keyed by custom_id, or None if the batch is not complete
+    """
+    try:
+        client = OpenAI(http_client=get_http_client())
+        
+        batch = client.batches.retrieve(batch_id)
+        while wait and batch.status in ("validating", "in_progress", "finalizing"):
+            time.sleep(BATCH_POLL_INTERVAL)
+            batch = client.batches.retrieve(batch_id)
+        
+        if batch.status != "completed":
+            logger.info("Optimize batch %s status: %s", batch_id, batch.status)
+            return None
+        
+        results = {}
+        output = client.files.content(batch.output_file_id).content
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            
+            record = orjson.loads(line)
+            custom_id = record.get("custom_id")
+            try:
+                if record.get("error"):
+                    raise ValueError(record["error"])
+                content = record["response"]["body"]["choices"][0]["message"]["content"]
+                results[custom_id] = _parse_response(content, OptimizedResume)
+            except (KeyError, IndexError, ValueError) as e:
+                logger.error("Error parsing batch result %s: %s", custom_id, e)
+                results[custom_id] = {}
+        
+        return results
+        
+    except Exception as e:
+        logger.error("Error retrieving optimize batch %s: %s", batch_id, e)
+        return None
+
+async def aparse_resume(resume_text):
+    """
+    Async version of parse_resume.
+    
+    Args:
+        resume_text (str): Raw resume text
+        
+    Returns:
+        dict: Structured resume data
+    """
+    try:
+        chain = _get_chain(PARSE_PROMPT, temperature=0, task="parse")
+        result = await _ainvoke(chain, {"resume_text": resume_text}, usage_config("aparse_resume"))
+        
+        try:
+            return _parse_response(result, ResumeData)
+        except ValidationError as e:
+            logger.error("Error parsing JSON from LLM response: %s", e)
+            logger.error("Raw response: %s", result)
+            return {}
+            
+    except RETRYABLE_ERRORS:
+        # Still failing after the retries; re-raised so callers can tell it apart from an empty result
+        raise
+    except Exception as e:
+        logger.error("Error parsing resume: %s", e)
+        return {}
+
+async def aanalyze_job_description(job_desc_text):
+    """
+    Async version of analyze_job_description.
+    
+    Args:
+        job_desc_text (str): Raw job description text
+        
+    Returns:
+        dict: Structured job requirements
+    """
+    try:
+        chain = _get_chain(ANALYZE_PROMPT, temperature=0, task="analyze")
+        result = await _ainvoke(chain, {"job_desc": job_desc_text}, usage_config("aanalyze_job_description"))
+        
+        try:
+            return _parse_response(result, JobAnalysis)
+        except ValidationError as e:
+            logger.error("Error parsing JSON from LLM response: %s", e)
+            logger.error("Raw response: %s", result)
+            return {}
+            
+    except RETRYABLE_ERRORS:
+        # Still failing after the retries; re-raised so callers can tell it apart from an empty result
+        raise
+    except Exception as e:
+        logger.error("Error analyzing job description: %s", e)
+        return {}
+
+async def aoptimize_resume_for_job(user_id, job_description, job_analysis=None):
+    """
+    Async version of optimize_resume_for_job.
+    
+    Args:
+        user_id (int): User ID
+        job_description (str): Raw job description text
+        job_analysis (dict, optional): Pre-analyzed job requirements
+        
+    Returns:
+        dict: Optimized resume data
+    """
+    try:
+        # Database access runs in a worker thread so it does not block the loop
+        if job_analysis:
+            resume_data = await asyncio.to_thread(_load_resume_data, user_id)
+        else:
+            resume_data, job_analysis = await asyncio.gather(
+                asyncio.to_thread(_load_resume_data, user_id),
+                aanalyze_job_description(job_description)
+            )
+        
+        if resume_data is None:
+            return {}
+        
+        chain = _get_chain(OPTIMIZE_PROMPT)
+        result = await _ainvoke_optimize(chain, {
+            "resume_data": _to_prompt_json(resume_data),
+            "job_description": job_description,
+            "job_analysis": _to_prompt_json(job_analysis)
+        }, usage_config("aoptimize_resume_for_job", user_id=user_id))
+        
+        try:
+            return _parse_response(result, OptimizedResume)
+        except ValidationError as e:
+            logger.error("Error parsing JSON from LLM response: %s", e)
+            logger.error("Raw response: %s", result)
             return resume_data
             
+    except RETRYABLE_ERRORS:
+        # Still failing after the retries; re-raised so callers can tell it apart from an empty result
+        raise
+    except Exception as e:
+        logger.error("Error optimizing resume: %s", e)
+        return {}
+
+# Prompt for per-section improvement suggestions
+SUGGEST_PROMPT = PromptTemplate(
+    input_variables=["section_name", "section_data"],
+    template="""
+            You are an expert resume reviewer. Suggest specific improvements for the {section_name} section of a resume.
+            
+            Section data:
+            {section_data}
+            
+            Return at most 3 short, actionable suggestions in this JSON format:
+            {{"suggestions": ["", ""]}}
+            
+            Respond ONLY with the JSON object. No other text before or after.
+            """
+)
+
+async def asuggest_for_section(section_name, section_data):
+    """
+    Ask the LLM for improvement suggestions for one resume section.
+    
+    Args:
+        section_name (str): Section label used in the prompt (e.g. "summary", "experience")
+        section_data: Section contents
+        
+    Returns:
+        list: Suggestion strings ([] on error)
+    """
+    try:
+        chain = _get_chain(SUGGEST_PROMPT, task="analyze")
+        result = await _ainvoke(chain, {
+            "section_name": section_name,
+            "section_data": _to_prompt_json(section_data)
+        }, usage_config("asuggest_for_section", section=section_name))
+        
+        try:
+            return _parse_response(result, SectionSuggestions).get("suggestions") or []
+        except ValidationError as e:
+            logger.error("Error parsing JSON from LLM response: %s", e)
+            logger.error("Raw response: %s", result)
+            return []
+            
+    except RETRYABLE_ERRORS:
+        # Still failing after the retries; re-raised so callers can tell it apart from an empty result
+        raise
     except Exception as e:
-        logger.error(f"Error optimizing resume: {str(e)}")
-        return {} 
\ No newline at end of file
+        logger.error("Error suggesting improvements for %s: %s", section_name, e)
+        return []
+
+def suggest_resume_improvements(resume_data):
+    """
+    Get LLM suggestions for each resume section, requesting up to BATCH_MAX_CONCURRENCY
+    sections concurrently.
+    
+    Args:
+        resume_data (dict): Parsed resume data
+        
+    Returns:
+        list: (section label, suggestions) tuples in resume order
+    """
+    sections = [("Summary", "summary", resume_data.get("basic_info", {}).get("summary", ""))]
+    for exp in resume_data.get("experiences", []):
+        sections.append((f"{exp.get('title', 'Role')} at {exp.get('company', 'Company')}", "experience", exp))
+    if resume_data.get("skills"):
+        sections.append(("Skills", "skills", resume_data["skills"]))
+    
+    async def gather_suggestions():
+        # Cap in-flight requests like the batch paths so long resumes do not burst into 429s
+        semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+        
+        async def suggest(section_name, section_data):
+            async with semaphore:
+                return await asuggest_for_section(section_name, section_data)
+        
+        return await asyncio.gather(*(
+            suggest(section_name, section_data)
+            for _, section_name, section_data in sections
+        ))
+    
+    suggestions = run_async(gather_suggestions())
+    return [(label, items) for (label, _, _), items in zip(sections, suggestions)]
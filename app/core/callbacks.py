@@ -0,0 +1,63 @@
+import logging
+import orjson
+from langchain_core.callbacks import BaseCallbackHandler
+
+logger = logging.getLogger(__name__)
+
+class UsageCallback(BaseCallbackHandler):
+    """Log token usage for each LLM call as a JSON record."""
+
+    def __init__(self, function, **fields):
+        """
+        Args:
+            function (str): Name of the function making the LLM call
+            **fields: Extra fields to include in the log record (e.g. user_id)
+        """
+        self.function = function
+        self.fields = fields
+
+    def on_llm_end(self, response, **kwargs):
+        """Read token counts from the LLM result and log them."""
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        
+        usage = (response.llm_output or {}).get("token_usage")
+        info = {}
+        if not usage and response.generations and response.generations[0]:
+            info = response.generations[0][-1].generation_info or {}
+            # Streamed OpenAI calls carry usage on their final chunk (see PooledChatOpenAI._stream)
+            usage = info.get("token_usage")
+        
+        if usage:
+            prompt_tokens = usage.get("prompt_tokens")
+            completion_tokens = usage.get("completion_tokens")
+        else:
+            # Ollama reports its counts on the generation instead of llm_output
+            prompt_tokens = info.get("prompt_eval_count")
+            completion_tokens = info.get("eval_count")
+        
+        # A record without counts says nothing; skip it instead of logging nulls
+        if prompt_tokens is None and completion_tokens is None:
+            logger.debug("No token usage reported for %s", self.function)
+            return
+        
+        record = {
+            "function": self.function,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            **self.fields
+        }
+        logger.info("%s", orjson.dumps(record, default=str).decode())
+
+def usage_config(function, **fields):
+    """
+    Build a runnable config that logs token usage.
+
+    Args:
+        function (str): Name of the function making the LLM call
+        **fields: Extra fields to include in the log record
+
+    Returns:
+        dict: Config for chain.invoke / ainvoke / batch / stream
+    """
+    return {"callbacks": [UsageCallback(function, **fields)]}
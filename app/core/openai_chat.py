@@ -0,0 +1,88 @@
+from langchain_core.load import dumps
+from langchain_core.messages import AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk
+from langchain_openai import ChatOpenAI
+from langchain_openai.chat_models.base import _convert_delta_to_message_chunk
+
+# Per-process objects that must not become part of the LLM cache key
+_UNCACHED_FIELDS = ("http_client", "http_async_client")
+
+# langchain-openai release PooledChatOpenAI._stream was copied from. Keep requirements.txt
+# pinned to it; tests/test_openai_chat.py fails when the installed version differs, so the
+# copy is re-checked against the new ChatOpenAI._stream before the pin is bumped.
+STREAM_COPIED_FROM = "0.1.3"
+
+class PooledChatOpenAI(ChatOpenAI):
+    """
+    ChatOpenAI that leaves the shared HTTP clients out of its LLM cache key and
+    reports token usage for streamed calls.
+    """
+    
+    def _get_llm_string(self, stop=None, **kwargs):
+        """
+        Build the LLM cache key without the httpx clients.
+        
+        The default key serializes every constructor argument, and the clients serialize
+        as their repr (with a memory address), so the persistent cache missed after every
+        restart. The key is otherwise built exactly as in BaseChatModel.
+        """
+        if not self.is_lc_serializable():
+            return super()._get_llm_string(stop=stop, **kwargs)
+        
+        params = {**kwargs, **{"stop": stop}}
+        param_string = str(sorted([(k, v) for k, v in params.items()]))
+        
+        serialized = self.to_json()
+        serialized["kwargs"] = {
+            key: value for key, value in serialized.get("kwargs", {}).items()
+            if key not in _UNCACHED_FIELDS
+        }
+        return dumps(serialized) + "---" + param_string
+    
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        """
+        Stream a chat completion, ending with a chunk that carries the token usage.
+        
+        Same as ChatOpenAI._stream, but requests stream_options.include_usage. The
+        usage arrives in a final chunk without choices, which the base class drops; it is
+        yielded as an empty chunk with generation_info["token_usage"] so UsageCallback
+        can log it.
+        
+        stream_options cannot go in model_kwargs: the API rejects it on non-streamed calls.
+        langchain-openai reports streamed usage itself from 0.1.9 (stream_usage), which
+        needs a newer langchain than this project pins; drop this override after upgrading.
+        """
+        message_dicts, params = self._create_message_dicts(messages, stop)
+        params = {**params, **kwargs, "stream": True, "stream_options": {"include_usage": True}}
+        
+        default_chunk_class = AIMessageChunk
+        with self.client.create(messages=message_dicts, **params) as response:
+            for chunk in response:
+                if not isinstance(chunk, dict):
+                    chunk = chunk.model_dump()
+                
+                if len(chunk["choices"]) == 0:
+                    if chunk.get("usage"):
+                        yield ChatGenerationChunk(
+                            message=default_chunk_class(content=""),
+                            generation_info={"token_usage": chunk["usage"]}
+                        )
+                    continue
+                
+                choice = chunk["choices"][0]
+                if choice["delta"] is None:
+                    continue
+                
+                message_chunk = _convert_delta_to_message_chunk(choice["delta"], default_chunk_class)
+                generation_info = {}
+                if finish_reason := choice.get("finish_reason"):
+                    generation_info["finish_reason"] = finish_reason
+                logprobs = choice.get("logprobs")
+                if logprobs:
+                    generation_info["logprobs"] = logprobs
+                
+                default_chunk_class = message_chunk.__class__
+                generation_chunk = ChatGenerationChunk(message=message_chunk, generation_info=generation_info or None)
+                if run_manager:
+                    run_manager.on_llm_new_token(generation_chunk.text, chunk=generation_chunk, logprobs=logprobs)
+                yield generation_chunk
@@ -0,0 +1,130 @@
+from typing import ClassVar, List, Optional, Union
+from pydantic import BaseModel, ConfigDict, model_validator
+
+_TEXT = Optional[str]
+_TEXT_LIST = Optional[List[str]]
+
+def _split_text(value, comma_separated=False):
+    """Split a string returned for a list field into its non-empty items."""
+    separator = "," if comma_separated and "\n" not in value else "\n"
+    return [item.strip() for item in value.split(separator) if item.strip()]
+
+class _Schema(BaseModel):
+    """Base schema that keeps any extra fields returned by the LLM."""
+    model_config = ConfigDict(extra="allow", coerce_numbers_to_str=True)
+    
+    # List fields whose single-line string form is comma separated (e.g. "Python, SQL")
+    _comma_separated: ClassVar[tuple] = ()
+    
+    @model_validator(mode="before")
+    @classmethod
+    def _coerce_text_fields(cls, data):
+        """
+        Accept a list for a text field and a string for a list-of-text field.
+        
+        LLMs mix the two shapes; without this one such field fails validation and
+        _parse_response discards the whole result.
+        """
+        if not isinstance(data, dict):
+            return data
+        
+        data = dict(data)
+        for name, field in cls.model_fields.items():
+            value = data.get(name)
+            if field.annotation == _TEXT and isinstance(value, list):
+                data[name] = "\n".join(str(item) for item in value if item is not None)
+            elif field.annotation == _TEXT_LIST and isinstance(value, str):
+                data[name] = _split_text(value, name in cls._comma_separated)
+        
+        return data
+
+class BasicInfo(_Schema):
+    name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    address: Optional[str] = None
+    linkedin: Optional[str] = None
+    github: Optional[str] = None
+    website: Optional[str] = None
+    summary: Optional[str] = None
+
+class ExperienceData(_Schema):
+    company: Optional[str] = None
+    title: Optional[str] = None
+    location: Optional[str] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    description: Optional[str] = None
+    achievements: Optional[List[str]] = None  # Newline-separated strings are split by _Schema
+
+class EducationData(_Schema):
+    institution: Optional[str] = None
+    degree: Optional[str] = None
+    field_of_study: Optional[str] = None
+    location: Optional[str] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    gpa: Optional[str] = None
+    description: Optional[str] = None
+
+class SkillData(_Schema):
+    name: Optional[str] = None
+    category: Optional[str] = None
+    proficiency: Optional[str] = None
+
+class CertificationData(_Schema):
+    name: Optional[str] = None
+    issuer: Optional[str] = None
+    date: Optional[str] = None
+    description: Optional[str] = None
+
+class ProjectData(_Schema):
+    name: Optional[str] = None
+    description: Optional[str] = None
+    technologies: Union[str, List[str], None] = None
+    url: Optional[str] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+
+class PublicationData(_Schema):
+    title: Optional[str] = None
+    publisher: Optional[str] = None
+    date: Optional[str] = None
+    url: Optional[str] = None
+    description: Optional[str] = None
+
+class AchievementData(_Schema):
+    title: Optional[str] = None
+    date: Optional[str] = None
+    description: Optional[str] = None
+
+class ResumeData(_Schema):
+    """Structured resume returned by the parse prompt."""
+    basic_info: Optional[BasicInfo] = None
+    experiences: Optional[List[ExperienceData]] = None
+    educations: Optional[List[EducationData]] = None
+    skills: Optional[List[SkillData]] = None
+    certifications: Optional[List[CertificationData]] = None
+    projects: Optional[List[ProjectData]] = None
+    publications: Optional[List[PublicationData]] = None
+    achievements: Optional[List[AchievementData]] = None
+
+class OptimizedResume(ResumeData):
+    """Optimized resume returned by the optimize prompt (same structure as the input resume)."""
+
+class JobAnalysis(_Schema):
+    """Structured job requirements returned by the analyze prompt."""
+    _comma_separated: ClassVar[tuple] = ("required_skills", "preferred_skills", "keywords")
+    
+    job_title: Optional[str] = None
+    company: Optional[str] = None
+    required_skills: Optional[List[str]] = None
+    preferred_skills: Optional[List[str]] = None
+    required_experience: Optional[str] = None
+    required_education: Optional[str] = None
+    job_responsibilities: Optional[List[str]] = None
+    keywords: Optional[List[str]] = None
+
+class SectionSuggestions(_Schema):
+    """Improvement suggestions for one resume section returned by the suggest prompt."""
+    suggestions: Optional[List[str]] = None
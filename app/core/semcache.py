@@ -0,0 +1,154 @@
+import os
+import copy
+import hashlib
+import logging
+import threading
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# The SEMANTIC_CACHE* settings are read when the cache is used rather than at import,
+# so values from .env apply even if this module is imported before it is loaded
+
+def semantic_cache_enabled():
+    """Check whether the SEMANTIC_CACHE setting is on."""
+    return os.getenv("SEMANTIC_CACHE", "false").lower() == "true"
+
+class SemanticCache:
+    """In-memory cache that returns a stored result for texts with similar embeddings."""
+    
+    def __init__(self, threshold=None, max_entries=None):
+        """
+        Args:
+            threshold (float, optional): Minimum cosine similarity for a cache hit;
+                SEMANTIC_CACHE_THRESHOLD (0.95) by default
+            max_entries (int, optional): Oldest entries are evicted beyond this size;
+                SEMANTIC_CACHE_SIZE (512) by default
+        """
+        self._threshold = threshold
+        self._max_entries = max_entries
+        self._vectors = None  # One normalized embedding per row
+        self._values = []
+        self._keys = []  # Text hash per row
+        self._exact = {}  # Text hash -> value, checked before embedding
+        self._lock = threading.Lock()
+    
+    @property
+    def threshold(self):
+        """Minimum cosine similarity for a cache hit."""
+        if self._threshold is None:
+            self._threshold = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+        return self._threshold
+    
+    @property
+    def max_entries(self):
+        """Maximum number of entries."""
+        if self._max_entries is None:
+            self._max_entries = int(os.getenv("SEMANTIC_CACHE_SIZE", "512"))
+        return self._max_entries
+    
+    def _embed(self, text):
+        """Embed and normalize a text with the vector store's embeddings."""
+        # Imported lazily so the cache does not load the embeddings until it is used
+        from app.database.vector_store import get_embeddings
+        
+        vector = np.asarray(get_embeddings().embed_query(text), dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+    
+    @staticmethod
+    def _text_key(text):
+        """Hash a text for the exact-match lookup."""
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+    
+    def _reset(self):
+        """Remove all entries; the caller holds the lock."""
+        self._vectors = None
+        self._values = []
+        self._keys = []
+        self._exact = {}
+    
+    def _lookup(self, vector):
+        """Return the most similar cached value if it is above the threshold."""
+        with self._lock:
+            if self._vectors is None:
+                return None
+            
+            if self._vectors.shape[1] != vector.shape[0]:
+                # The embedding model changed (e.g. EMBEDDING_PROVIDER); old entries cannot be compared
+                logger.info("Embedding size changed, clearing semantic cache")
+                self._reset()
+                return None
+            
+            scores = self._vectors @ vector
+            best = int(np.argmax(scores))
+            if scores[best] >= self.threshold:
+                return self._values[best]
+        return None
+    
+    def _store(self, key, vector, value):
+        """Add an entry, evicting the oldest one when full."""
+        with self._lock:
+            if key in self._exact:
+                # Another thread stored the same text first
+                return
+            
+            if self._vectors is None or self._vectors.shape[1] != vector.shape[0]:
+                self._reset()
+                self._vectors = vector[np.newaxis, :]
+                self._values = [value]
+                self._keys = [key]
+            else:
+                start = max(0, len(self._values) - self.max_entries + 1)
+                for evicted in self._keys[:start]:
+                    self._exact.pop(evicted, None)
+                self._vectors = np.vstack((self._vectors[start:], vector))
+                self._values = self._values[start:] + [value]
+                self._keys = self._keys[start:] + [key]
+            
+            self._exact[key] = value
+    
+    def get_or_compute(self, text, compute):
+        """
+        Return a cached result for a similar text, or compute and cache a new one.
+        
+        Args:
+            text (str): Text the result depends on
+            compute (callable): Called with no arguments on a cache miss
+        
+        Returns:
+            The cached or computed result, as a copy the caller may modify. Empty results
+            are not cached.
+        """
+        # Identical text skips the embedding round trip
+        key = self._text_key(text)
+        with self._lock:
+            cached = self._exact.get(key)
+        if cached is not None:
+            logger.info("Semantic cache hit (exact text)")
+            return copy.deepcopy(cached)
+        
+        try:
+            vector = self._embed(text)
+        except Exception as e:
+            # Without an embedding the cache is skipped, not the call
+            logger.error("Error embedding text for semantic cache: %s", e)
+            return compute()
+        
+        cached = self._lookup(vector)
+        if cached is not None:
+            logger.info("Semantic cache hit")
+            return copy.deepcopy(cached)
+        
+        value = compute()
+        if value:
+            # Stored as a copy so later changes to the caller's result do not reach the cache
+            self._store(key, vector, copy.deepcopy(value))
+        return value
+    
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._reset()
+
+# Cache for job description analyses
+job_analysis_cache = SemanticCache()
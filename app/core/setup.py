@@ -1,52 +1,72 @@
 import os
 import logging
-from pathlib import Path
+from functools import lru_cache
 from app.database.db_manager import init_database
 from app.database.vector_store import init_vector_store
-from app.core.ai_manager import set_model_provider
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler()
-    ]
-)
 
 logger = logging.getLogger(__name__)
 
+def configure_logging():
+    """Configure root logging; a no-op if logging is already configured."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler()
+        ]
+    )
+
+# Leaf directories; makedirs creates the parent "data" directory as needed
+APP_DIRS = (
+    "data/vectordb",
+    "data/uploads",
+    "data/generated_resumes"
+)
+
 def create_directory_structure():
     """Creates the necessary directory structure for the application."""
-    dirs = [
-        "data",
-        "data/vectordb",
-        "data/uploads",
-        "data/generated_resumes"
-    ]
-    
-    for dir_path in dirs:
-        Path(dir_path).mkdir(parents=True, exist_ok=True)
-        logger.info(f"Created directory: {dir_path}")
+    for dir_path in APP_DIRS:
+        os.makedirs(dir_path, exist_ok=True)
+    
+    logger.debug("Ensured directories exist: %s", ", ".join(APP_DIRS))
 
-def initialize_model():
-    """Initialize the AI model based on environment settings."""
+@lru_cache(maxsize=None)
+def get_model_settings():
+    """
+    Read the model provider and model from the environment.
+    
+    The result is cached for the process; call get_model_settings.cache_clear()
+    after changing the environment variables.
+    
+    Returns:
+        tuple: (model_provider, model)
+    """
     model_provider = os.getenv("MODEL_PROVIDER", "openai")
-    model = None
     
     if model_provider == "openai":
         model = os.getenv("LLM_MODEL", "gpt-4-turbo")
     else:  # ollama
         model = os.getenv("OLLAMA_MODEL", "mistral")
     
-    logger.info(f"Initializing AI with provider: {model_provider}, model: {model}")
+    return model_provider, model
+
+def initialize_model():
+    """Initialize the AI model and LLM response cache based on environment settings."""
+    # Imported lazily so importing setup does not load LangChain and the LLM clients
+    from app.core.ai_manager import set_model_provider, init_llm_cache
+    
+    init_llm_cache()
+    
+    model_provider, model = get_model_settings()
+    
+    logger.info("Initializing AI with provider: %s, model: %s", model_provider, model)
     
     try:
         set_model_provider(model_provider, model)
         logger.info("AI model initialized successfully")
         return True
     except Exception as e:
-        logger.error(f"Error initializing AI model: {str(e)}")
+        logger.error("Error initializing AI model: %s", e)
         logger.warning("Reverting to OpenAI as fallback. Check your model settings.")
         
         # Try to fallback to OpenAI if Ollama fails
@@ -55,12 +75,27 @@ def initialize_model():
                 set_model_provider("openai", "gpt-4-turbo")
                 logger.info("Fallback to OpenAI successful")
             except Exception as e2:
-                logger.error(f"Fallback initialization failed: {str(e2)}")
+                logger.error("Fallback initialization failed: %s", e2)
         
         return False
 
+# Set once initialize_app has run in this process
+_initialized = False
+
 def initialize_app():
-    """Initialize the SmartResumeAI application."""
+    """
+    Initialize the SmartResumeAI application.
+    
+    main.py calls this on every Streamlit rerun; the setup itself runs once per process
+    so reruns do not re-check the databases or reset the model caches.
+    """
+    global _initialized
+    
+    configure_logging()
+    
+    if _initialized:
+        return
+    
     logger.info("Initializing SmartResumeAI application...")
     
     # Create directory structure
@@ -73,4 +108,5 @@ def initialize_app():
     # Initialize AI model
     initialize_model()
     
+    _initialized = True
     logger.info("Application initialization complete.") 
\ No newline at end of file
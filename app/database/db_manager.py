@@ -1,28 +1,60 @@
 import os
+import atexit
 import logging
-import sqlite3
-from sqlalchemy import create_engine, MetaData, Table, Column, Integer, String, Text, DateTime, ForeignKey
+import threading
+from sqlalchemy import create_engine, event, func, select, insert, update, delete, Column, Integer, String, Text, DateTime, ForeignKey, Index
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
-import datetime
-
 logger = logging.getLogger(__name__)
 
 # Get database path from environment variables
 DB_PATH = os.getenv("DATABASE_PATH", "data/resume_db.sqlite")
 
-# Create SQLAlchemy engine and session
-engine = create_engine(f"sqlite:///{DB_PATH}", echo=False)
+# Bump whenever a table or index changes so init_database re-runs create_all
+EXPECTED_SCHEMA_VERSION = 1
+
+# Seconds between periodic PRAGMA optimize runs
+OPTIMIZE_INTERVAL = 15 * 60
+
+# Create SQLAlchemy engine and session.
+# A small process-wide pool keeps connections (and their PRAGMAs) open between requests
+# while still giving each thread its own connection and transaction.
+engine = create_engine(
+    f"sqlite:///{DB_PATH}",
+    echo=False,
+    poolclass=QueuePool,
+    pool_size=5,
+    max_overflow=5,
+    connect_args={"check_same_thread": False}
+)
+
+@event.listens_for(engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply performance PRAGMAs to each new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MiB
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
 Session = sessionmaker(bind=engine)
 Base = declarative_base()
 
-# Define database models
+# Current UTC time with millisecond precision, evaluated by SQLite rather than Python
+SQL_NOW = func.strftime("%Y-%m-%d %H:%M:%f", "now")
+
+# Define database models; each _EXPORT lists the columns exchanged with resume_data
 class User(Base):
     __tablename__ = 'users'
+    _EXPORT = ("name", "email", "phone", "address", "linkedin", "github", "website", "summary")
     
     id = Column(Integer, primary_key=True)
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+    created_at = Column(DateTime, default=SQL_NOW, server_default=SQL_NOW)
+    updated_at = Column(DateTime, default=SQL_NOW, server_default=SQL_NOW, onupdate=SQL_NOW)
     
     # Resume sections as relationships
     experiences = relationship("Experience", back_populates="user", cascade="all, delete-orphan")
@@ -45,9 +77,10 @@ class User(Base):
 
 class Experience(Base):
     __tablename__ = 'experiences'
+    _EXPORT = ("company", "title", "location", "start_date", "end_date", "description", "achievements")
     
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey('users.id'))
+    user_id = Column(Integer, ForeignKey('users.id'), index=True)
     user = relationship("User", back_populates="experiences")
     
     company = Column(String(100))
@@ -58,14 +91,15 @@ class Experience(Base):
     description = Column(Text)
     achievements = Column(Text)
     
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+    created_at = Column(DateTime, default=SQL_NOW, server_default=SQL_NOW)
+    updated_at = Column(DateTime, default=SQL_NOW, server_default=SQL_NOW, onupdate=SQL_NOW)
 
 class Education(Base):
     __tablename__ = 'educations'
+    _EXPORT = ("institution", "degree", "field_of_study", "location", "start_date", "end_date", "gpa", "description")
     
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey('users.id'))
+    user_id = Column(Integer, ForeignKey('users.id'), index=True)
     user = relationship("User", back_populates="educations")
     
     institution = Column(String(100))
@@ -77,28 +111,30 @@ class Education(Base):
     gpa = Column(String(20))
     description = Column(Text)
     
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+    created_at = Column(DateTime, default=SQL_NOW, server_default=SQL_NOW)
+    updated_at = Column(DateTime, default=SQL_NOW, server_default=SQL_NOW, onupdate=SQL_NOW)
 
 class Skill(Base):
     __tablename__ = 'skills'
+    _EXPORT = ("name", "category", "proficiency")
     
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey('users.id'))
+    user_id = Column(Integer, ForeignKey('users.id'), index=True)
     user = relationship("User", back_populates="skills")
     
     name = Column(String(100))
     category = Column(String(100))
     proficiency = Column(String(50))
     
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+    created_at = Column(DateTime, default=SQL_NOW, server_default=SQL_NOW)
+    updated_at = Column(DateTime, default=SQL_NOW, server_default=SQL_NOW, onupdate=SQL_NOW)
 
 class Certification(Base):
     __tablename__ = 'certifications'
+    _EXPORT = ("name", "issuer", "date", "description")
     
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey('users.id'))
+    user_id = Column(Integer, ForeignKey('users.id'), index=True)
     user = relationship("User", back_populates="certifications")
     
     name = Column(String(100))
@@ -106,14 +142,15 @@ class Certification(Base):
     date = Column(String(50))
     description = Column(Text)
     
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+    created_at = Column(DateTime, default=SQL_NOW, server_default=SQL_NOW)
+    updated_at = Column(DateTime, default=SQL_NOW, server_default=SQL_NOW, onupdate=SQL_NOW)
 
 class Project(Base):
     __tablename__ = 'projects'
+    _EXPORT = ("name", "description", "technologies", "url", "start_date", "end_date")
     
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey('users.id'))
+    user_id = Column(Integer, ForeignKey('users.id'), index=True)
     user = relationship("User", back_populates="projects")
     
     name = Column(String(100))
@@ -123,14 +160,15 @@ class Project(Base):
     start_date = Column(String(50))
     end_date = Column(String(50))
     
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+    created_at = Column(DateTime, default=SQL_NOW, server_default=SQL_NOW)
+    updated_at = Column(DateTime, default=SQL_NOW, server_default=SQL_NOW, onupdate=SQL_NOW)
 
 class Publication(Base):
     __tablename__ = 'publications'
+    _EXPORT = ("title", "publisher", "date", "url", "description")
     
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey('users.id'))
+    user_id = Column(Integer, ForeignKey('users.id'), index=True)
     user = relationship("User", back_populates="publications")
     
     title = Column(String(255))
@@ -139,25 +177,27 @@ class Publication(Base):
     url = Column(String(255))
     description = Column(Text)
     
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+    created_at = Column(DateTime, default=SQL_NOW, server_default=SQL_NOW)
+    updated_at = Column(DateTime, default=SQL_NOW, server_default=SQL_NOW, onupdate=SQL_NOW)
 
 class Achievement(Base):
     __tablename__ = 'achievements'
+    _EXPORT = ("title", "date", "description")
     
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey('users.id'))
+    user_id = Column(Integer, ForeignKey('users.id'), index=True)
     user = relationship("User", back_populates="achievements")
     
     title = Column(String(255))
     date = Column(String(50))
     description = Column(Text)
     
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+    created_at = Column(DateTime, default=SQL_NOW, server_default=SQL_NOW)
+    updated_at = Column(DateTime, default=SQL_NOW, server_default=SQL_NOW, onupdate=SQL_NOW)
 
 class JobDescription(Base):
     __tablename__ = 'job_descriptions'
+    __table_args__ = (Index('ix_job_descriptions_company_title', 'company', 'title'),)
     
     id = Column(Integer, primary_key=True)
     title = Column(String(255))
@@ -165,8 +205,90 @@ class JobDescription(Base):
     description = Column(Text)
     original_text = Column(Text)
     
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+    created_at = Column(DateTime, default=SQL_NOW, server_default=SQL_NOW)
+    updated_at = Column(DateTime, default=SQL_NOW, server_default=SQL_NOW, onupdate=SQL_NOW)
+
+class SchemaMeta(Base):
+    __tablename__ = 'schema_meta'
+    
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False)
+
+@event.listens_for(Session, "before_flush")
+def touch_user_on_section_change(session, flush_context, instances):
+    """Bump users.updated_at whenever one of the user's resume sections changes."""
+    user_ids = {
+        obj.user_id
+        for obj in session.new | session.dirty | session.deleted
+        if not isinstance(obj, User) and getattr(obj, "user_id", None)
+    }
+    if not user_ids:
+        return
+    
+    with session.no_autoflush:
+        for user_id in user_ids:
+            user = session.get(User, user_id)
+            if user is not None:
+                user.updated_at = SQL_NOW
+
+def optimize_database():
+    """Run PRAGMA optimize so SQLite refreshes its query planner statistics."""
+    try:
+        connection = engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute("PRAGMA optimize")
+            cursor.close()
+        finally:
+            connection.close()
+        return True
+    except Exception as e:
+        logger.error("Error optimizing database: %s", e)
+        return False
+
+_optimize_timer = None
+
+def _schedule_optimize():
+    """Run PRAGMA optimize every OPTIMIZE_INTERVAL seconds in a background timer."""
+    global _optimize_timer
+    
+    def run():
+        optimize_database()
+        _schedule_optimize()
+    
+    _optimize_timer = threading.Timer(OPTIMIZE_INTERVAL, run)
+    _optimize_timer.daemon = True
+    _optimize_timer.start()
+
+def get_schema_version():
+    """
+    Read the schema version stored in the database.
+    
+    Returns:
+        int: Stored version, or None if the database has not been versioned yet
+    """
+    try:
+        with engine.connect() as connection:
+            return connection.execute(select(SchemaMeta.__table__.c.version)).scalar()
+    except OperationalError:
+        # schema_meta does not exist yet
+        return None
+
+def create_schema():
+    """Create all tables and indexes, then record EXPECTED_SCHEMA_VERSION."""
+    Base.metadata.create_all(engine)
+    
+    # create_all skips existing tables, so add indexes missing from older databases
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+    
+    meta = SchemaMeta.__table__
+    with engine.begin() as connection:
+        connection.execute(delete(meta))
+        connection.execute(insert(meta).values(id=1, version=EXPECTED_SCHEMA_VERSION))
+    
+    logger.info("Database schema created at version %s", EXPECTED_SCHEMA_VERSION)
 
 def init_database():
     """Initialize the SQLite database."""
@@ -174,15 +296,149 @@ def init_database():
         # Create database directory if it doesn't exist
         os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
         
-        # Create tables
-        Base.metadata.create_all(engine)
-        logger.info(f"Database initialized successfully at {DB_PATH}")
+        # Create tables and indexes only when the stored schema version is out of date
+        if get_schema_version() != EXPECTED_SCHEMA_VERSION:
+            create_schema()
+        
+        # Refresh query planner statistics once per process at startup, then periodically
+        # and at shutdown; init_database may be called again on later Streamlit reruns
+        if _optimize_timer is None:
+            optimize_database()
+            _schedule_optimize()
+            atexit.register(optimize_database)
+        
+        logger.info("Database initialized successfully at %s", DB_PATH)
         
         return True
     except Exception as e:
-        logger.error(f"Error initializing database: {str(e)}")
+        logger.error("Error initializing database: %s", e)
         return False
 
 def get_session():
     """Get a database session."""
-    return Session() 
\ No newline at end of file
+    return Session()
+
+# Resume section models keyed by their resume_data section name
+SECTION_MODELS = {
+    "experiences": Experience,
+    "educations": Education,
+    "skills": Skill,
+    "certifications": Certification,
+    "projects": Project,
+    "publications": Publication,
+    "achievements": Achievement
+}
+
+def _row_values(model, row):
+    """Get a section row's column values; list values such as achievements are stored one per line."""
+    values = {key: row.get(key, "") for key in model._EXPORT}
+    for key, value in values.items():
+        if isinstance(value, list):
+            values[key] = "\n".join(value)
+    return values
+
+def bulk_save_user(user_data, user_id=None, **sections):
+    """
+    Create or update a user and replace their resume sections in one transaction.
+    
+    Args:
+        user_data (dict): Basic info values for the users row
+        user_id (int, optional): Existing user to update; a new user is created if None or not found
+        **sections: Lists of row dicts keyed by section name (experiences, educations, ...),
+            in the shape get_user_bundle returns. Sections that are not passed are left unchanged.
+        
+    Returns:
+        int: User ID, or None on error
+    """
+    try:
+        with Session.begin() as session:
+            # updated_at is bumped by its onupdate expression
+            values = {key: user_data.get(key, "") for key in User._EXPORT}
+            
+            updated = 0
+            if user_id is not None:
+                updated = session.execute(update(User).where(User.id == user_id).values(**values)).rowcount
+            if not updated:
+                user_id = session.execute(insert(User).values(**values)).inserted_primary_key[0]
+            
+            for name, rows in sections.items():
+                if rows is None:
+                    continue
+                
+                model = SECTION_MODELS[name]
+                session.execute(delete(model).where(model.user_id == user_id))
+                if rows:
+                    # One executemany INSERT per section table
+                    session.execute(insert(model), [
+                        {"user_id": user_id, **_row_values(model, row)}
+                        for row in rows
+                    ])
+        
+        return user_id
+    except Exception as e:
+        logger.error("Error saving user: %s", e)
+        return None
+
+def get_user_updated_at(user_id):
+    """
+    Get when a user or any of their resume sections last changed.
+    
+    Args:
+        user_id (int): User ID
+        
+    Returns:
+        datetime: users.updated_at, or None if the user does not exist
+    """
+    with engine.connect() as connection:
+        return connection.execute(
+            select(User.__table__.c.updated_at).where(User.__table__.c.id == user_id)
+        ).scalar()
+
+def get_user_name(user_id):
+    """
+    Get a user's name without loading the ORM object.
+    
+    Args:
+        user_id (int): User ID
+        
+    Returns:
+        str: User name, or None if the user does not exist
+    """
+    with engine.connect() as connection:
+        return connection.execute(
+            select(User.__table__.c.name).where(User.__table__.c.id == user_id)
+        ).scalar()
+
+def get_user_bundle(user_id):
+    """
+    Load a user's resume data with Core selects, without building ORM objects.
+    
+    Args:
+        user_id (int): User ID
+        
+    Returns:
+        dict: Resume data in the parse_resume structure, or None if the user does not exist
+    """
+    with engine.connect() as connection:
+        users = User.__table__
+        user = connection.execute(
+            select(*[users.c[key] for key in User._EXPORT]).where(users.c.id == user_id)
+        ).mappings().first()
+        
+        if user is None:
+            return None
+        
+        bundle = {"basic_info": dict(user)}
+        for name, model in SECTION_MODELS.items():
+            table = model.__table__
+            rows = connection.execute(
+                select(*[table.c[key] for key in model._EXPORT])
+                .where(table.c.user_id == user_id)
+                .order_by(table.c.id)
+            ).mappings()
+            bundle[name] = [dict(row) for row in rows]
+    
+    for exp in bundle["experiences"]:
+        exp["achievements"] = exp["achievements"].split("\n") if exp["achievements"] else []
+    
+    return bundle
@@ -1,99 +1,200 @@
 import os
 import logging
-import chromadb
-from chromadb.config import Settings
-from langchain_community.vectorstores import Chroma
-from langchain_openai import OpenAIEmbeddings
 
 logger = logging.getLogger(__name__)
 
 # Get vector database path from environment variables
 VECTOR_DB_PATH = os.getenv("VECTOR_DB_PATH", "data/vectordb")
-EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-ada-002")
+
+# HNSW index settings applied when a collection is created
+COLLECTION_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 32,
+    "hnsw:construction_ef": 200,
+    "hnsw:search_ef": 64
+}
 
 # Initialize embeddings
 embeddings = None
 
+# Shared ChromaDB client and LangChain wrappers keyed by collection name
+_client = None
+_vector_dbs = {}
+
+def get_client():
+    """Get the shared ChromaDB persistent client."""
+    global _client
+    
+    if _client is None:
+        # Imported lazily: chromadb is slow to import and only needed once the vector store is used
+        import chromadb
+        _client = chromadb.PersistentClient(path=VECTOR_DB_PATH)
+    
+    return _client
+
 def get_embeddings():
-    """Get OpenAI embeddings instance."""
+    """Get the embeddings instance for the configured provider (openai or local)."""
     global embeddings
     
     if embeddings is None:
+        # Read on first use rather than at import, so the settings from .env apply
+        embedding_provider = os.getenv("EMBEDDING_PROVIDER", "openai")
         try:
-            embeddings = OpenAIEmbeddings(model=EMBEDDING_MODEL)
+            if embedding_provider == "local":
+                # Runs on the CPU in-process, no network round-trip per text
+                from langchain_community.embeddings import HuggingFaceEmbeddings
+                embeddings = HuggingFaceEmbeddings(
+                    model_name=os.getenv("LOCAL_EMBEDDING_MODEL", "BAAI/bge-small-en-v1.5"),
+                    encode_kwargs={
+                        "batch_size": int(os.getenv("EMBEDDING_BATCH_SIZE", "32")),
+                        "normalize_embeddings": True
+                    }
+                )
+            else:
+                from langchain_openai import OpenAIEmbeddings
+                embeddings = OpenAIEmbeddings(model=os.getenv("EMBEDDING_MODEL", "text-embedding-ada-002"))
         except Exception as e:
-            logger.error(f"Error initializing OpenAI embeddings: {str(e)}")
+            logger.error("Error initializing %s embeddings: %s", embedding_provider, e)
             raise
     
     return embeddings
 
+def get_or_create_collection(name):
+    """
+    Get a ChromaDB collection, creating it with COLLECTION_METADATA when missing.
+    
+    get_or_create_collection(metadata=...) would overwrite the metadata of an existing
+    collection without rebuilding its index, so the settings are only passed on create.
+    
+    Args:
+        name (str): Collection name
+        
+    Returns:
+        Collection: ChromaDB collection
+    """
+    client = get_client()
+    
+    try:
+        collection = client.get_collection(name=name)
+    except ValueError:
+        # Raised by chromadb when the collection does not exist
+        return client.create_collection(name=name, metadata=COLLECTION_METADATA)
+    
+    space = (collection.metadata or {}).get("hnsw:space", "l2")
+    if space != COLLECTION_METADATA["hnsw:space"]:
+        logger.warning(
+            "Collection %s uses %s distance instead of %s; delete %s to rebuild it with the new settings",
+            name, space, COLLECTION_METADATA["hnsw:space"], VECTOR_DB_PATH
+        )
+    
+    return collection
+
 def init_vector_store():
     """Initialize ChromaDB vector store."""
     try:
         # Create vector database directory if it doesn't exist
         os.makedirs(VECTOR_DB_PATH, exist_ok=True)
         
-        # Initialize ChromaDB client
-        client = chromadb.PersistentClient(path=VECTOR_DB_PATH)
-        
-        # Ensure collections exist
-        if "resume_data" not in client.list_collections():
-            client.create_collection(name="resume_data")
-        
-        if "job_descriptions" not in client.list_collections():
-            client.create_collection(name="job_descriptions")
+        # Ensure collections exist (keyed lookup, creates only when missing)
+        get_or_create_collection("resume_data")
+        get_or_create_collection("job_descriptions")
         
-        logger.info(f"Vector store initialized successfully at {VECTOR_DB_PATH}")
+        logger.info("Vector store initialized successfully at %s", VECTOR_DB_PATH)
         return True
     
     except Exception as e:
-        logger.error(f"Error initializing vector store: {str(e)}")
+        logger.error("Error initializing vector store: %s", e)
         return False
 
+def _get_vector_db(collection_name):
+    """Get the cached LangChain vector store for a collection."""
+    db = _vector_dbs.get(collection_name)
+    if db is None:
+        from langchain_community.vectorstores import Chroma
+        
+        # Create the collection with the HNSW settings first; the wrapper is given no
+        # metadata so it does not overwrite the settings of an existing collection
+        get_or_create_collection(collection_name)
+        db = Chroma(
+            client=get_client(),
+            collection_name=collection_name, 
+            embedding_function=get_embeddings()
+        )
+        _vector_dbs[collection_name] = db
+    
+    return db
+
 def get_resume_vector_db():
     """Get the resume data vector store."""
     try:
-        return Chroma(
-            collection_name="resume_data", 
-            embedding_function=get_embeddings(),
-            persist_directory=VECTOR_DB_PATH
-        )
+        return _get_vector_db("resume_data")
     except Exception as e:
-        logger.error(f"Error getting resume vector DB: {str(e)}")
+        logger.error("Error getting resume vector DB: %s", e)
         raise
 
 def get_job_vector_db():
     """Get the job descriptions vector store."""
     try:
-        return Chroma(
-            collection_name="job_descriptions", 
-            embedding_function=get_embeddings(),
-            persist_directory=VECTOR_DB_PATH
-        )
+        return _get_vector_db("job_descriptions")
     except Exception as e:
-        logger.error(f"Error getting job vector DB: {str(e)}")
+        logger.error("Error getting job vector DB: %s", e)
         raise
 
-def add_resume_data(data_id, text, metadata=None):
-    """Add resume data to vector store."""
+def _add_texts(db, items):
+    """Add (id, text, metadata) items to a vector store in a single call."""
+    if not items:
+        return
+    
+    ids, texts, metadatas = [], [], []
+    for item_id, text, metadata in items:
+        ids.append(str(item_id))
+        texts.append(text)
+        metadatas.append(metadata or {})
+    
+    db.add_texts(texts=texts, metadatas=metadatas, ids=ids)
+
+def add_resume_data_bulk(items):
+    """
+    Add several resume data items to the vector store at once.
+    
+    Args:
+        items (list): (data_id, text, metadata) tuples
+        
+    Returns:
+        bool: Success status
+    """
     try:
-        db = get_resume_vector_db()
-        db.add_texts(texts=[text], metadatas=[metadata or {}], ids=[str(data_id)])
+        _add_texts(get_resume_vector_db(), items)
         return True
     except Exception as e:
-        logger.error(f"Error adding resume data to vector store: {str(e)}")
+        logger.error("Error adding resume data to vector store: %s", e)
         return False
 
-def add_job_description(job_id, text, metadata=None):
-    """Add job description to vector store."""
+def add_job_description_bulk(items):
+    """
+    Add several job descriptions to the vector store at once.
+    
+    Args:
+        items (list): (job_id, text, metadata) tuples
+        
+    Returns:
+        bool: Success status
+    """
     try:
-        db = get_job_vector_db()
-        db.add_texts(texts=[text], metadatas=[metadata or {}], ids=[str(job_id)])
+        _add_texts(get_job_vector_db(), items)
         return True
     except Exception as e:
-        logger.error(f"Error adding job description to vector store: {str(e)}")
+        logger.error("Error adding job description to vector store: %s", e)
         return False
 
+def add_resume_data(data_id, text, metadata=None):
+    """Add resume data to vector store."""
+    return add_resume_data_bulk([(data_id, text, metadata)])
+
+def add_job_description(job_id, text, metadata=None):
+    """Add job description to vector store."""
+    return add_job_description_bulk([(job_id, text, metadata)])
+
 def search_resume_data(query, limit=5):
     """Search resume data in vector store."""
     try:
@@ -101,7 +202,7 @@ def search_resume_data(query, limit=5):
         results = db.similarity_search_with_score(query, k=limit)
         return results
     except Exception as e:
-        logger.error(f"Error searching resume data: {str(e)}")
+        logger.error("Error searching resume data: %s", e)
         return []
 
 def search_job_descriptions(query, limit=5):
@@ -111,5 +212,5 @@ def search_job_descriptions(query, limit=5):
         results = db.similarity_search_with_score(query, k=limit)
         return results
     except Exception as e:
-        logger.error(f"Error searching job descriptions: {str(e)}")
+        logger.error("Error searching job descriptions: %s", e)
         return [] 
\ No newline at end of file
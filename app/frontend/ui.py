@@ -1,20 +1,133 @@
 import os
 import streamlit as st
 import logging
-import time
 from datetime import datetime
-import pandas as pd
-import json
+import orjson
+import hashlib
+import re
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from app.utils.file_parser import save_uploaded_file, extract_text_from_file
+from app.utils.resume_utils import group_skills
 from app.core.ai_manager import (
-    parse_resume, analyze_job_description, optimize_resume_for_job,
-    list_available_models, set_model_provider, get_llm
+    parse_resume, analyze_job_description, optimize_resume_for_job_stream,
+    parse_optimized_resume, chat_about_resume_stream, summarize_chat_history_async,
+    suggest_resume_improvements, list_available_models, set_model_provider, get_llm,
+    RETRYABLE_ERRORS
 )
-from app.database.db_manager import get_session, User, Experience, Education, Skill, Certification, Project, Publication, Achievement
-from app.pdf_generation.resume_generator import generate_pdf_resume, generate_docx_resume
+from app.database.db_manager import bulk_save_user, get_user_name
+from app.core.setup import get_model_settings
 
 logger = logging.getLogger(__name__)
 
+# Builds the PDF and DOCX for the Generate Resume page in parallel
+_document_executor = ThreadPoolExecutor(max_workers=2)
+
+# Number of most recent chat messages sent verbatim; older ones are summarized
+CHAT_HISTORY_WINDOW = 6
+
+# Fragments (st.fragment, or st.experimental_fragment on 1.33-1.36) rerun only the decorated
+# page on widget interaction. Older Streamlit versions render the page normally.
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+def render_json(data, expanded=False):
+    """
+    Render data with st.json, serializing it with orjson instead of the stdlib encoder.
+    
+    The tree starts collapsed by default so large resumes render quickly.
+    """
+    st.json(orjson.dumps(data, default=str).decode(), expanded=expanded)
+
+# Shown when the LLM provider still fails after the retries in ai_manager
+LLM_UNAVAILABLE_MESSAGE = "The AI service is not responding right now (rate limit or connection error). Please try again in a minute."
+
+def show_llm_error(error):
+    """Log an LLM request that failed after its retries and tell the user."""
+    logger.error("LLM request failed after retries: %s", error)
+    st.error(LLM_UNAVAILABLE_MESSAGE)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _parse_resume_cached(resume_text, model_provider, model):
+    """
+    Parse resume text, caching the result per text and model across reruns.
+    
+    Raises ValueError when parsing fails so the failure is not cached.
+    """
+    resume_data = parse_resume(resume_text)
+    if not resume_data:
+        raise ValueError("Resume could not be parsed")
+    return resume_data
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _analyze_job_description_cached(job_description, model_provider, model):
+    """
+    Analyze a job description, caching the result per text and model across reruns.
+    
+    Raises ValueError when analysis fails so the failure is not cached.
+    """
+    job_analysis = analyze_job_description(job_description)
+    if not job_analysis:
+        raise ValueError("Job description could not be analyzed")
+    return job_analysis
+
+def parse_resume_cached(resume_text):
+    """
+    Parse resume text with the current model, reusing cached results. Returns {} when the
+    response could not be parsed; errors from an unavailable provider are raised.
+    """
+    try:
+        return _parse_resume_cached(resume_text, st.session_state.model_provider, st.session_state.selected_model)
+    except ValueError:
+        return {}
+
+def analyze_job_description_cached(job_description):
+    """
+    Analyze a job description with the current model, reusing cached results. Returns {}
+    when the response could not be parsed; errors from an unavailable provider are raised.
+    """
+    try:
+        return _analyze_job_description_cached(job_description, st.session_state.model_provider, st.session_state.selected_model)
+    except ValueError:
+        return {}
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _get_user_name(user_id):
+    """Look up the user's name for the sidebar, cached across reruns."""
+    return get_user_name(user_id)
+
+@lru_cache(maxsize=128)
+def _skill_pattern(skills):
+    """Compile one alternation regex matching any of the (lowercased) skills."""
+    return re.compile("|".join(map(re.escape, skills)))
+
+def match_skills(resume_skills, job_skills):
+    """
+    Compare resume skills with job skills by case-insensitive substring match.
+    
+    Args:
+        resume_skills (list): Skill names from the resume
+        job_skills (list): Required and preferred skills from the job analysis
+        
+    Returns:
+        tuple: (resume skills containing a job skill, job skills not found in any resume skill)
+    """
+    resume_lower = [skill.lower() for skill in resume_skills]
+    job_lower = [skill.lower() for skill in job_skills]
+    
+    matching = []
+    if job_lower:
+        # A single regex search per resume skill instead of one substring check per job skill
+        pattern = _skill_pattern(tuple(job_lower))
+        matching = [skill for skill, lower in zip(resume_skills, resume_lower) if pattern.search(lower)]
+    
+    missing = list(job_skills)
+    if resume_lower:
+        # Skill names never span lines, so one joined string covers every resume skill
+        resume_text = "\n".join(resume_lower)
+        missing = [skill for skill, lower in zip(job_skills, job_lower) if lower not in resume_text]
+    
+    return matching, missing
+
 # Session state initialization
 def init_session_state():
     """Initialize session state variables."""
@@ -22,6 +135,8 @@ def init_session_state():
         st.session_state.user_id = None
     if "chat_history" not in st.session_state:
         st.session_state.chat_history = []
+    if "chat_summary" not in st.session_state:
+        reset_chat_summary()
     if "resume_data" not in st.session_state:
         st.session_state.resume_data = {}
     if "job_description" not in st.session_state:
@@ -31,18 +146,20 @@ def init_session_state():
     if "optimized_resume" not in st.session_state:
         st.session_state.optimized_resume = {}
     if "model_provider" not in st.session_state:
-        st.session_state.model_provider = os.getenv("MODEL_PROVIDER", "openai")
-    if "selected_model" not in st.session_state:
-        if st.session_state.model_provider == "openai":
-            st.session_state.selected_model = os.getenv("LLM_MODEL", "gpt-4-turbo")
-        else:
-            st.session_state.selected_model = os.getenv("OLLAMA_MODEL", "mistral")
+        # Process-wide cached read of the model environment variables
+        st.session_state.model_provider, st.session_state.selected_model = get_model_settings()
 
 def render_ui():
     """Render the Streamlit UI."""
     # Initialize session state
     init_session_state()
     
+    # One timestamp per session keeps download file names stable across reruns
+    st.session_state.setdefault("_run_ts", datetime.now().strftime('%Y%m%d_%H%M%S'))
+    
+    if st.session_state.pop("_data_cleared", False):
+        st.toast("All data cleared!", icon="✅")
+    
     # App header
     st.title("SmartResumeAI")
     st.subheader("AI-Powered Resume Tailoring for Job Success")
@@ -53,10 +170,9 @@ def render_ui():
         
         # Display username if available
         if st.session_state.user_id:
-            session = get_session()
-            user = session.query(User).filter(User.id == st.session_state.user_id).first()
-            if user and user.name:
-                st.success(f"Logged in as: {user.name}")
+            user_name = _get_user_name(st.session_state.user_id)
+            if user_name:
+                st.success(f"Logged in as: {user_name}")
         
         # Navigation
         page = st.radio("Navigation", [
@@ -74,15 +190,15 @@ def render_ui():
             # Reset session state
             st.session_state.user_id = None
             st.session_state.chat_history = []
+            reset_chat_summary()
             st.session_state.resume_data = {}
             st.session_state.job_description = ""
             st.session_state.job_analysis = {}
             st.session_state.optimized_resume = {}
-            st.success("All data cleared!")
             
-            # Wait for a moment and then rerun the app
-            time.sleep(1)
-            st.experimental_rerun()
+            # Confirm after the rerun; a message shown before st.rerun() would be discarded
+            st.session_state._data_cleared = True
+            st.rerun()
     
     # Main content based on selected page
     if page == "🏠 Home":
@@ -227,6 +343,9 @@ def render_settings_page():
                     os.environ["OLLAMA_MODEL"] = selected_model
                     os.environ["OLLAMA_HOST"] = st.session_state.ollama_host
                 
+                # Make the next startup check read the new environment
+                get_model_settings.cache_clear()
+                
                 # Update session state
                 st.session_state.model_provider = model_provider
                 st.session_state.selected_model = selected_model
@@ -278,50 +397,67 @@ def render_resume_upload_page():
     # Show currently uploaded resume data if available
     if st.session_state.resume_data:
         st.success("✅ Resume data available")
+        st.download_button(
+            "Download parsed JSON",
+            data=orjson.dumps(st.session_state.resume_data, default=str, option=orjson.OPT_INDENT_2),
+            file_name="resume.json",
+            mime="application/json"
+        )
         if st.checkbox("Show currently parsed resume data"):
-            st.json(st.session_state.resume_data)
+            render_json(st.session_state.resume_data)
     
     # File upload
     st.markdown("### Upload your resume")
     uploaded_file = st.file_uploader("Choose a file", type=["pdf", "docx", "txt"])
     
     if uploaded_file is not None:
-        # Save the uploaded file
-        with st.spinner("Uploading resume..."):
-            file_path = save_uploaded_file(uploaded_file)
-            
-            if file_path:
-                st.success(f"File uploaded successfully: {uploaded_file.name}")
+        # Skip saving, extraction and parsing when this exact file was already parsed
+        file_hash = hashlib.blake2b(uploaded_file.getbuffer(), digest_size=16).hexdigest()
+        
+        if st.session_state.resume_data and st.session_state.get("_resume_hash") == file_hash:
+            st.info(f"{uploaded_file.name} has already been parsed.")
+        else:
+            # Save the uploaded file
+            with st.spinner("Uploading resume..."):
+                file_path = save_uploaded_file(uploaded_file)
                 
-                # Extract text from file
-                with st.spinner("Extracting text from resume..."):
-                    resume_text = extract_text_from_file(file_path)
+                if file_path:
+                    st.success(f"File uploaded successfully: {uploaded_file.name}")
                     
-                    if resume_text:
-                        st.success("Text extracted successfully")
+                    # Extract text from file
+                    with st.spinner("Extracting text from resume..."):
+                        resume_text = extract_text_from_file(file_path)
                         
-                        # Parse resume text
-                        with st.spinner("Parsing resume with AI..."):
-                            resume_data = parse_resume(resume_text)
+                        if resume_text:
+                            st.success("Text extracted successfully")
                             
-                            if resume_data:
-                                st.success("Resume parsed successfully")
-                                
-                                # Save to session state
-                                st.session_state.resume_data = resume_data
+                            # Parse resume text
+                            with st.spinner("Parsing resume with AI..."):
+                                try:
+                                    resume_data = parse_resume_cached(resume_text)
+                                except RETRYABLE_ERRORS as e:
+                                    show_llm_error(e)
+                                    resume_data = None
                                 
-                                # Create or update user in database
-                                create_or_update_user(resume_data)
-                                
-                                # Display parsed data
-                                st.subheader("Parsed Resume Data")
-                                st.json(resume_data)
-                            else:
-                                st.error("Error parsing resume. Please try again.")
-                    else:
-                        st.error("Error extracting text from file. Please try another file format.")
-            else:
-                st.error("Error uploading file. Please try again.")
+                                if resume_data:
+                                    st.success("Resume parsed successfully")
+                                    
+                                    # Save to session state
+                                    st.session_state.resume_data = resume_data
+                                    st.session_state._resume_hash = file_hash
+                                    
+                                    # Create or update user in database
+                                    create_or_update_user(resume_data)
+                                    
+                                    # Display parsed data
+                                    st.subheader("Parsed Resume Data")
+                                    render_json(resume_data)
+                                elif resume_data is not None:
+                                    st.error("Error parsing resume. Please try again.")
+                        else:
+                            st.error("Error extracting text from file. Please try another file format.")
+                else:
+                    st.error("Error uploading file. Please try again.")
     
     # Manual input option
     st.markdown("### Or enter resume data manually")
@@ -355,14 +491,97 @@ def render_resume_upload_page():
                     "skills": []
                 }
                 
-                # Save to session state
+                # Save to session state; the data no longer comes from the uploaded file
                 st.session_state.resume_data = resume_data
+                st.session_state.pop("_resume_hash", None)
                 
                 # Create or update user in database
                 create_or_update_user(resume_data)
                 
                 st.success("Resume data saved successfully")
 
+def get_resume_context():
+    """
+    Get the resume data serialized for the chat prompt.
+    
+    resume_data is always replaced rather than mutated, so the serialized text is
+    kept in session state until a different resume_data object is stored.
+    
+    Returns:
+        str: Compact JSON of the current resume data
+    """
+    resume_data = st.session_state.resume_data
+    if st.session_state.get("_resume_context_source") is not resume_data:
+        st.session_state._resume_context = orjson.dumps(resume_data, default=str).decode()
+        st.session_state._resume_context_source = resume_data
+    
+    return st.session_state._resume_context
+
+def format_chat_messages(messages):
+    """Format chat messages as "role: content" blocks for a prompt."""
+    return "\n\n".join(f"{msg['role']}: {msg['content']}" for msg in messages)
+
+def reset_chat_summary():
+    """Forget the running chat summary."""
+    st.session_state.chat_summary = ""
+    st.session_state.chat_summary_count = 0
+    st.session_state.chat_summary_future = None
+
+def _collect_chat_summary():
+    """Store the background summary once it has finished."""
+    future = st.session_state.chat_summary_future
+    if future is not None and future.done():
+        try:
+            summary = future.result()
+        except RETRYABLE_ERRORS as e:
+            # Background work: keep the current summary and try again on a later turn
+            logger.error("Error summarizing chat history: %s", e)
+            st.session_state.chat_summary_future = None
+            return
+        
+        st.session_state.chat_summary = summary
+        st.session_state.chat_summary_count = st.session_state.chat_summary_target
+        st.session_state.chat_summary_future = None
+
+def get_chat_history_text():
+    """
+    Build the chat history for the prompt from the running summary and the messages
+    not yet folded into it, so prompt size stays bounded on long chats.
+    
+    Returns:
+        str: Chat history text
+    """
+    _collect_chat_summary()
+    
+    # At most about two windows of messages, since older ones are summarized in the background
+    recent = st.session_state.chat_history[st.session_state.chat_summary_count:]
+    
+    history_text = format_chat_messages(recent)
+    if st.session_state.chat_summary:
+        history_text = f"Summary of earlier conversation: {st.session_state.chat_summary}\n\n{history_text}"
+    
+    return history_text
+
+def schedule_chat_summary():
+    """
+    Start folding messages older than the window into the summary in the background
+    once another CHAT_HISTORY_WINDOW of them has accumulated.
+    """
+    _collect_chat_summary()
+    if st.session_state.chat_summary_future is not None:
+        return
+    
+    history = st.session_state.chat_history
+    start = st.session_state.chat_summary_count
+    end = len(history) - CHAT_HISTORY_WINDOW
+    if end - start >= CHAT_HISTORY_WINDOW:
+        st.session_state.chat_summary_target = end
+        st.session_state.chat_summary_future = summarize_chat_history_async(
+            st.session_state.chat_summary,
+            format_chat_messages(history[start:end]),
+            user_id=st.session_state.user_id
+        )
+
 def render_resume_chat_page():
     """Render the resume chat page."""
     st.header("Resume Chat")
@@ -372,18 +591,6 @@ def render_resume_chat_page():
         st.warning("Please upload your resume first.")
         return
     
-    # Initialize OpenAI client if not already done
-    if "chat_initialized" not in st.session_state:
-        try:
-            # Just a placeholder to check if we can initialize LLM
-            from app.core.ai_manager import get_llm
-            llm = get_llm()
-            st.session_state.chat_initialized = True
-        except Exception as e:
-            st.error(f"Error initializing chat: {str(e)}")
-            st.error("Please make sure your OpenAI API key is set correctly.")
-            return
-    
     # Display chat history
     st.subheader("Chat with AI about your resume")
     
@@ -403,68 +610,45 @@ def render_resume_chat_page():
         
         # Generate AI response
         with st.chat_message("assistant"):
+            placeholder = st.empty()
+            ai_response = ""
+            
             with st.spinner("Thinking..."):
-                # Here we would normally call the AI to generate a response
-                # For now, we'll just generate a mock response
                 try:
-                    from app.core.ai_manager import get_llm
-                    from langchain.chains import LLMChain
-                    from langchain.prompts import PromptTemplate
-                    
-                    llm = get_llm()
-                    
                     # Prepare context from resume data
-                    resume_context = json.dumps(st.session_state.resume_data, indent=2)
+                    resume_context = get_resume_context()
                     
                     # Prepare chat history
-                    chat_history_text = ""
-                    for msg in st.session_state.chat_history:
-                        chat_history_text += f"{msg['role']}: {msg['content']}\n\n"
-                    
-                    # Create prompt
-                    prompt_template = PromptTemplate(
-                        input_variables=["resume_data", "chat_history", "user_message"],
-                        template="""
-                        You are an AI resume assistant helping a user improve their resume.
-                        
-                        Here is the user's resume data:
-                        {resume_data}
-                        
-                        Chat history:
-                        {chat_history}
-                        
-                        The user's latest message is:
-                        {user_message}
-                        
-                        Provide a helpful response that helps the user improve their resume.
-                        If they ask for improvements, be specific about how they can enhance their resume.
-                        If they want to add or modify information, explain how to do that effectively.
-                        Be concise but thorough in your advice.
-                        """
-                    )
-                    
-                    # Create chain
-                    chain = LLMChain(llm=llm, prompt=prompt_template)
+                    chat_history_text = get_chat_history_text()
                     
-                    # Generate response
-                    response = chain.invoke({
-                        "resume_data": resume_context,
-                        "chat_history": chat_history_text,
-                        "user_message": prompt
-                    })
+                    # Stream the response so the answer appears as it is generated
+                    for chunk in chat_about_resume_stream(
+                        resume_context,
+                        chat_history_text,
+                        prompt,
+                        user_id=st.session_state.user_id
+                    ):
+                        ai_response += chunk
+                        placeholder.markdown(ai_response + "▌")
                     
-                    ai_response = response.get("text", "I'm sorry, I couldn't generate a response.")
+                    if not ai_response:
+                        ai_response = "I'm sorry, I couldn't generate a response."
                     
+                except RETRYABLE_ERRORS as e:
+                    logger.error("LLM request failed after retries: %s", e)
+                    ai_response = LLM_UNAVAILABLE_MESSAGE
                 except Exception as e:
-                    logger.error(f"Error generating AI response: {str(e)}")
+                    logger.error("Error generating AI response: %s", e)
                     ai_response = "I'm sorry, I encountered an error. Please try again."
-                
-                # Display AI response
-                st.markdown(ai_response)
-                
-                # Add AI response to chat history
-                st.session_state.chat_history.append({"role": "assistant", "content": ai_response})
+            
+            # Display AI response
+            placeholder.markdown(ai_response)
+            
+            # Add AI response to chat history
+            st.session_state.chat_history.append({"role": "assistant", "content": ai_response})
+            schedule_chat_summary()
 
+@fragment
 def render_job_matching_page():
     """Render the job matching page."""
     st.header("Job Matching")
@@ -474,78 +658,151 @@ def render_job_matching_page():
         st.warning("Please upload your resume first.")
         return
     
-    # Job description input
+    # Job description input; the form keeps typing and pasting from rerunning the page
     st.subheader("Enter Job Description")
-    job_description = st.text_area("Paste job description here", st.session_state.job_description, height=300)
+    with st.form("jd_form"):
+        job_description = st.text_area("Paste job description here", st.session_state.job_description, height=300)
+        submitted = st.form_submit_button("Analyze Job Description")
     
-    if st.button("Analyze Job Description"):
+    if submitted:
         if job_description:
             # Save job description to session state
             st.session_state.job_description = job_description
             
             # Analyze job description
             with st.spinner("Analyzing job description..."):
-                job_analysis = analyze_job_description(job_description)
-                
-                if job_analysis:
-                    # Save job analysis to session state
-                    st.session_state.job_analysis = job_analysis
-                    
-                    # Display job analysis
-                    st.subheader("Job Analysis")
-                    st.json(job_analysis)
-                    
-                    # Match with resume
-                    st.subheader("Resume Match")
-                    
-                    # Extract required skills from job
-                    required_skills = job_analysis.get("required_skills", [])
-                    preferred_skills = job_analysis.get("preferred_skills", [])
-                    all_skills = required_skills + preferred_skills
-                    
-                    # Extract skills from resume
-                    resume_skills = [skill.get("name", "") for skill in st.session_state.resume_data.get("skills", [])]
-                    
-                    # Find matching skills
-                    matching_skills = [skill for skill in resume_skills if any(job_skill.lower() in skill.lower() for job_skill in all_skills)]
-                    missing_skills = [skill for skill in all_skills if not any(skill.lower() in resume_skill.lower() for resume_skill in resume_skills)]
-                    
-                    # Display skills match
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.markdown("#### Matching Skills")
-                        for skill in matching_skills:
-                            st.success(skill)
-                    
-                    with col2:
-                        st.markdown("#### Missing Skills")
-                        for skill in missing_skills:
-                            st.warning(skill)
-                    
-                    # Generate resume optimization button
-                    if st.button("Optimize Resume for This Job"):
-                        with st.spinner("Optimizing resume..."):
-                            # Here we would normally call the AI to optimize the resume
-                            optimized_resume = optimize_resume_for_job(
-                                st.session_state.user_id, 
-                                job_description, 
-                                job_analysis
-                            )
-                            
-                            if optimized_resume:
-                                # Save optimized resume to session state
-                                st.session_state.optimized_resume = optimized_resume
-                                
-                                # Display success message
-                                st.success("Resume optimized successfully! Go to the 'Generate Resume' page to download.")
-                            else:
-                                st.error("Error optimizing resume. Please try again.")
-                else:
-                    st.error("Error analyzing job description. Please try again.")
+                try:
+                    job_analysis = analyze_job_description_cached(job_description)
+                except RETRYABLE_ERRORS as e:
+                    show_llm_error(e)
+                    job_analysis = None
+            
+            # Save job analysis to session state
+            st.session_state.job_analysis = job_analysis or {}
+            if job_analysis == {}:
+                st.error("Error analyzing job description. Please try again.")
         else:
             st.error("Please enter a job description.")
+    
+    # Results stay visible on later reruns, so the optimize button below keeps working
+    job_analysis = st.session_state.job_analysis
+    if not job_analysis:
+        return
+    
+    # Display job analysis
+    st.subheader("Job Analysis")
+    render_json(job_analysis)
+    
+    # Match with resume
+    st.subheader("Resume Match")
+    
+    # Extract required skills from job
+    required_skills = job_analysis.get("required_skills", [])
+    preferred_skills = job_analysis.get("preferred_skills", [])
+    all_skills = required_skills + preferred_skills
+    
+    # Extract skills from resume
+    resume_skills = [skill.get("name", "") for skill in st.session_state.resume_data.get("skills", [])]
+    
+    # Find matching skills
+    matching_skills, missing_skills = match_skills(resume_skills, all_skills)
+    
+    # Display skills match as one table instead of one element per skill
+    import pandas as pd
+    
+    skills_match = pd.DataFrame({
+        "Matching Skills": pd.Series(matching_skills, dtype=object),
+        "Missing Skills": pd.Series(missing_skills, dtype=object)
+    }).fillna("")
+    st.dataframe(skills_match, use_container_width=True, hide_index=True)
+    
+    # Generate resume optimization button
+    if st.button("Optimize Resume for This Job"):
+        with st.spinner("Optimizing resume..."):
+            # Stream the optimized resume so progress is visible while it generates
+            placeholder = st.empty()
+            response_text = ""
+            try:
+                for chunk in optimize_resume_for_job_stream(
+                    st.session_state.user_id, 
+                    st.session_state.job_description, 
+                    job_analysis
+                ):
+                    response_text += chunk
+                    placeholder.code(response_text, language="json")
+            except RETRYABLE_ERRORS as e:
+                placeholder.empty()
+                show_llm_error(e)
+                return
+            placeholder.empty()
+            
+            optimized_resume = parse_optimized_resume(response_text)
+            
+            if optimized_resume:
+                # Save optimized resume to session state
+                st.session_state.optimized_resume = optimized_resume
+                
+                # Display success message
+                st.success("Resume optimized successfully! Go to the 'Generate Resume' page to download.")
+            else:
+                st.error("Error optimizing resume. Please try again.")
 
+@st.cache_data(show_spinner=False)
+def analyze_resume_data(resume_data):
+    """
+    Compute the Resume Analysis page's derived views, cached per resume data.
+    
+    Args:
+        resume_data (dict): Parsed resume data
+        
+    Returns:
+        dict: skill_categories (category -> skill names), missing_sections and improvements
+    """
+    basic_info = resume_data.get("basic_info", {})
+    experiences = resume_data.get("experiences", [])
+    
+    # Group skills by category
+    skill_categories = group_skills(resume_data.get("skills", []))
+    
+    # Check for missing sections
+    missing_sections = [
+        title for key, title in (
+            ("experiences", "Experience"),
+            ("educations", "Education"),
+            ("skills", "Skills"),
+            ("projects", "Projects"),
+            ("certifications", "Certifications")
+        )
+        if not resume_data.get(key, [])
+    ]
+    
+    # Check for potential improvements
+    improvements = []
+    
+    # Check if summary is missing or too short
+    if len(basic_info.get("summary") or "") < 100:
+        improvements.append("Add a more detailed professional summary (aim for 100-200 characters)")
+    
+    # Check if experiences have achievements
+    for exp in experiences:
+        if not exp.get("achievements"):
+            improvements.append(f"Add achievements for your {exp.get('title')} role at {exp.get('company')}")
+    
+    # Check if contact info is complete
+    if not basic_info.get("email") or not basic_info.get("phone"):
+        improvements.append("Add complete contact information (email and phone)")
+    
+    # Check if LinkedIn profile is present
+    if not basic_info.get("linkedin"):
+        improvements.append("Add your LinkedIn profile URL")
+    
+    return {
+        "skill_categories": skill_categories,
+        "missing_sections": missing_sections,
+        "improvements": improvements
+    }
+
+@fragment
 def render_resume_analysis_page():
     """Render the resume analysis page."""
     st.header("Resume Analysis")
@@ -620,69 +877,82 @@ def render_resume_analysis_page():
     st.subheader("Skills")
     skills = resume_data.get("skills", [])
     
+    # Derived views are cached until the resume data changes
+    analysis = analyze_resume_data(resume_data)
+    improvements = analysis["improvements"]
+    
     if skills:
-        # Group skills by category
-        skill_categories = {}
-        for skill in skills:
-            category = skill.get("category", "Other")
-            if category not in skill_categories:
-                skill_categories[category] = []
-            skill_categories[category].append(skill.get("name", ""))
-        
         # Display skills by category
-        for category, skills in skill_categories.items():
-            st.markdown(f"**{category}:** {', '.join(skills)}")
+        for category, names in analysis["skill_categories"].items():
+            st.markdown(f"**{category}:** {', '.join(names)}")
     else:
         st.markdown("No skills data available.")
     
     # Resume gaps and suggestions
     st.subheader("Resume Analysis")
     
-    # Check for missing sections
-    missing_sections = []
-    if not experiences:
-        missing_sections.append("Experience")
-    if not educations:
-        missing_sections.append("Education")
-    if not skills:
-        missing_sections.append("Skills")
-    if not resume_data.get("projects", []):
-        missing_sections.append("Projects")
-    if not resume_data.get("certifications", []):
-        missing_sections.append("Certifications")
-    
+    missing_sections = analysis["missing_sections"]
     if missing_sections:
         st.warning(f"Missing sections: {', '.join(missing_sections)}")
     else:
         st.success("All key sections are present in your resume.")
     
-    # Check for potential improvements
-    improvements = []
-    
-    # Check if summary is missing or too short
-    if not basic_info.get("summary") or len(basic_info.get("summary", "")) < 100:
-        improvements.append("Add a more detailed professional summary (aim for 100-200 characters)")
+    # Display improvement suggestions
+    if improvements:
+        st.subheader("Suggested Improvements")
+        st.info("\n".join(f"- {improvement}" for improvement in improvements))
     
-    # Check if experiences have achievements
-    if experiences:
-        for i, exp in enumerate(experiences):
-            if not exp.get("achievements") or (isinstance(exp.get("achievements"), list) and len(exp.get("achievements", [])) == 0):
-                improvements.append(f"Add achievements for your {exp.get('title')} role at {exp.get('company')}")
+    # LLM suggestions per section, requested concurrently; kept until the resume data changes
+    st.subheader("AI Suggestions")
+    if st.button("Get AI Suggestions"):
+        with st.spinner("Reviewing your resume..."):
+            try:
+                st.session_state.ai_suggestions = (resume_data, suggest_resume_improvements(resume_data))
+            except RETRYABLE_ERRORS as e:
+                show_llm_error(e)
+    
+    source, section_suggestions = st.session_state.get("ai_suggestions", (None, []))
+    if source is resume_data:
+        for label, items in section_suggestions:
+            if items:
+                st.markdown(f"**{label}**")
+                st.markdown("\n".join(f"- {item}" for item in items))
+
+def _build_document(kind, resume_data, formatted_data):
+    """Generate a PDF or DOCX resume and return its bytes (None on error)."""
+    from app.pdf_generation.resume_generator import generate_pdf_resume, generate_docx_resume
     
-    # Check if contact info is complete
-    if not basic_info.get("email") or not basic_info.get("phone"):
-        improvements.append("Add complete contact information (email and phone)")
+    generate = generate_pdf_resume if kind == "pdf" else generate_docx_resume
+    return generate(resume_data, formatted_data=formatted_data)
+
+def get_resume_documents(resume_data):
+    """
+    Start generating the PDF and DOCX for resume_data in the background.
     
-    # Check if LinkedIn profile is present
-    if not basic_info.get("linkedin"):
-        improvements.append("Add your LinkedIn profile URL")
+    Both documents are built in parallel from one formatting pass, once per resume data
+    object, so they are ready by the time the user reaches the download buttons.
     
-    # Display improvement suggestions
-    if improvements:
-        st.subheader("Suggested Improvements")
-        for improvement in improvements:
-            st.info(improvement)
+    Args:
+        resume_data (dict): Resume data to render
+        
+    Returns:
+        dict: Futures resolving to the document bytes, keyed by 'pdf' and 'docx'
+    """
+    documents = st.session_state.get("_resume_documents")
+    if documents is None or documents[0] is not resume_data:
+        # Imported on first use so other pages do not load the document libraries
+        from app.pdf_generation.resume_generator import format_resume_as_dict
+        
+        formatted_data = format_resume_as_dict(resume_data)
+        documents = (resume_data, {
+            kind: _document_executor.submit(_build_document, kind, resume_data, formatted_data)
+            for kind in ("pdf", "docx")
+        })
+        st.session_state._resume_documents = documents
+    
+    return documents[1]
 
+@fragment
 def render_generate_resume_page():
     """Render the generate resume page."""
     st.header("Generate Resume")
@@ -700,223 +970,122 @@ def render_generate_resume_page():
     # Get resume data
     resume_data = st.session_state.optimized_resume if use_optimized else st.session_state.resume_data
     
+    # Documents build in the background while the preview renders
+    documents = get_resume_documents(resume_data)
+    
     # Display preview
     st.subheader("Resume Preview")
     
+    # The preview is rendered with a single st.markdown call
+    lines = []
+    
     # Basic info
     basic_info = resume_data.get("basic_info", {})
-    st.markdown(f"## {basic_info.get('name', 'Your Name')}")
+    lines.append(f"## {basic_info.get('name', 'Your Name')}")
     
     # Contact info
     contact_parts = []
-    if basic_info.get("email"):
-        contact_parts.append(basic_info["email"])
-    if basic_info.get("phone"):
-        contact_parts.append(basic_info["phone"])
-    if basic_info.get("linkedin"):
-        contact_parts.append(basic_info["linkedin"])
+    if (email := basic_info.get("email")):
+        contact_parts.append(email)
+    if (phone := basic_info.get("phone")):
+        contact_parts.append(phone)
+    if (linkedin := basic_info.get("linkedin")):
+        contact_parts.append(linkedin)
     
-    st.markdown(f"### {' | '.join(contact_parts)}")
+    lines.append(f"### {' | '.join(contact_parts)}")
     
     # Summary
-    if basic_info.get("summary"):
-        st.markdown("### PROFESSIONAL SUMMARY")
-        st.markdown(basic_info.get("summary"))
+    if (summary := basic_info.get("summary")):
+        lines.append("### PROFESSIONAL SUMMARY")
+        lines.append(summary)
     
     # Experience
     experiences = resume_data.get("experiences", [])
     if experiences:
-        st.markdown("### PROFESSIONAL EXPERIENCE")
+        lines.append("### PROFESSIONAL EXPERIENCE")
         
         for exp in experiences:
-            st.markdown(f"**{exp.get('title', 'Role')} - {exp.get('company', 'Company')}**")
-            st.markdown(f"*{exp.get('start_date', 'Start Date')} - {exp.get('end_date', 'End Date')} | {exp.get('location', 'Location')}*")
+            lines.append(f"**{exp.get('title', 'Role')} - {exp.get('company', 'Company')}**")
+            lines.append(f"*{exp.get('start_date', 'Start Date')} - {exp.get('end_date', 'End Date')} | {exp.get('location', 'Location')}*")
             
-            if exp.get("description"):
-                st.markdown(exp.get("description"))
+            if (description := exp.get("description")):
+                lines.append(description)
             
-            achievements = exp.get("achievements", [])
-            if achievements:
-                if isinstance(achievements, str):
-                    achievements = achievements.split("\n")
-                
-                for achievement in achievements:
-                    if achievement.strip():
-                        st.markdown(f"- {achievement.strip()}")
+            # One tight list per experience
+            bullets = [f"- {achievement.strip()}" for achievement in exp.get("achievements") or [] if achievement.strip()]
+            if bullets:
+                lines.append("\n".join(bullets))
     
     # Education
     educations = resume_data.get("educations", [])
     if educations:
-        st.markdown("### EDUCATION")
+        lines.append("### EDUCATION")
         
         for edu in educations:
-            st.markdown(f"**{edu.get('degree', 'Degree')} in {edu.get('field_of_study', 'Field of Study')}**")
-            st.markdown(f"*{edu.get('institution', 'Institution')} | {edu.get('start_date', 'Start Date')} - {edu.get('end_date', 'End Date')}*")
+            lines.append(f"**{edu.get('degree', 'Degree')} in {edu.get('field_of_study', 'Field of Study')}**")
+            lines.append(f"*{edu.get('institution', 'Institution')} | {edu.get('start_date', 'Start Date')} - {edu.get('end_date', 'End Date')}*")
             
-            if edu.get("gpa"):
-                st.markdown(f"GPA: {edu.get('gpa')}")
+            if (gpa := edu.get("gpa")):
+                lines.append(f"GPA: {gpa}")
     
     # Skills
     skills = resume_data.get("skills", [])
     if skills:
-        st.markdown("### SKILLS")
-        
-        # Group skills by category
-        skill_categories = {}
-        for skill in skills:
-            category = skill.get("category", "Other")
-            if category not in skill_categories:
-                skill_categories[category] = []
-            skill_categories[category].append(skill.get("name", ""))
+        lines.append("### SKILLS")
         
         # Display skills by category
-        for category, skills in skill_categories.items():
-            st.markdown(f"**{category}:** {', '.join(skills)}")
+        for category, names in group_skills(skills).items():
+            lines.append(f"**{category}:** {', '.join(names)}")
+    
+    st.markdown("\n\n".join(lines))
     
     # Download options
     st.subheader("Download Resume")
     
     col1, col2 = st.columns(2)
     
-    with col1:
-        if st.button("Generate PDF"):
-            with st.spinner("Generating PDF..."):
-                pdf_path = generate_pdf_resume(resume_data)
-                
-                if pdf_path:
-                    # Read PDF file
-                    with open(pdf_path, "rb") as f:
-                        pdf_bytes = f.read()
-                    
-                    # Create download button
-                    st.download_button(
-                        label="Download PDF",
-                        data=pdf_bytes,
-                        file_name=f"resume_{datetime.now().strftime('%Y%m%d')}.pdf",
-                        mime="application/pdf"
-                    )
-                else:
-                    st.error("Error generating PDF. Please try again.")
-    
-    with col2:
-        if st.button("Generate DOCX"):
-            with st.spinner("Generating DOCX..."):
-                docx_path = generate_docx_resume(resume_data)
-                
-                if docx_path:
-                    # Read DOCX file
-                    with open(docx_path, "rb") as f:
-                        docx_bytes = f.read()
-                    
-                    # Create download button
-                    st.download_button(
-                        label="Download DOCX",
-                        data=docx_bytes,
-                        file_name=f"resume_{datetime.now().strftime('%Y%m%d')}.docx",
-                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                    )
-                else:
-                    st.error("Error generating DOCX. Please try again.")
+    for column, kind, label, mime in (
+        (col1, "pdf", "PDF", "application/pdf"),
+        (col2, "docx", "DOCX", "application/vnd.openxmlformats-officedocument.wordprocessingml.document")
+    ):
+        with column:
+            with st.spinner(f"Generating {label}..."):
+                document_bytes = documents[kind].result()
+            
+            if document_bytes:
+                st.download_button(
+                    label=f"Download {label}",
+                    data=document_bytes,
+                    file_name=f"resume_{st.session_state._run_ts}.{kind}",
+                    mime=mime
+                )
+            else:
+                st.error(f"Error generating {label}. Please try again.")
+                # Build again on the next rerun
+                st.session_state.pop("_resume_documents", None)
 
 def create_or_update_user(resume_data):
     """Create or update user in database."""
-    try:
-        session = get_session()
-        
-        # Check if user exists
-        if st.session_state.user_id:
-            user = session.query(User).filter(User.id == st.session_state.user_id).first()
-            if not user:
-                user = User()
-        else:
-            user = User()
-        
-        # Update basic info
-        basic_info = resume_data.get("basic_info", {})
-        user.name = basic_info.get("name", "")
-        user.email = basic_info.get("email", "")
-        user.phone = basic_info.get("phone", "")
-        user.address = basic_info.get("address", "")
-        user.linkedin = basic_info.get("linkedin", "")
-        user.github = basic_info.get("github", "")
-        user.website = basic_info.get("website", "")
-        user.summary = basic_info.get("summary", "")
-        
-        # If new user, add to database
-        if not user.id:
-            session.add(user)
-            session.commit()
-            
-            # Save user ID to session state
-            st.session_state.user_id = user.id
-        else:
-            session.commit()
-        
-        # Update experiences
-        if "experiences" in resume_data:
-            # Delete existing experiences
-            for exp in user.experiences:
-                session.delete(exp)
-            
-            # Add new experiences
-            for exp_data in resume_data.get("experiences", []):
-                exp = Experience(
-                    user_id=user.id,
-                    company=exp_data.get("company", ""),
-                    title=exp_data.get("title", ""),
-                    location=exp_data.get("location", ""),
-                    start_date=exp_data.get("start_date", ""),
-                    end_date=exp_data.get("end_date", ""),
-                    description=exp_data.get("description", ""),
-                    achievements="\n".join(exp_data.get("achievements", [])) if isinstance(exp_data.get("achievements", []), list) else exp_data.get("achievements", "")
-                )
-                session.add(exp)
-        
-        # Update educations
-        if "educations" in resume_data:
-            # Delete existing educations
-            for edu in user.educations:
-                session.delete(edu)
-            
-            # Add new educations
-            for edu_data in resume_data.get("educations", []):
-                edu = Education(
-                    user_id=user.id,
-                    institution=edu_data.get("institution", ""),
-                    degree=edu_data.get("degree", ""),
-                    field_of_study=edu_data.get("field_of_study", ""),
-                    location=edu_data.get("location", ""),
-                    start_date=edu_data.get("start_date", ""),
-                    end_date=edu_data.get("end_date", ""),
-                    gpa=edu_data.get("gpa", ""),
-                    description=edu_data.get("description", "")
-                )
-                session.add(edu)
-        
-        # Update skills
-        if "skills" in resume_data:
-            # Delete existing skills
-            for skill in user.skills:
-                session.delete(skill)
-            
-            # Add new skills
-            for skill_data in resume_data.get("skills", []):
-                skill = Skill(
-                    user_id=user.id,
-                    name=skill_data.get("name", ""),
-                    category=skill_data.get("category", ""),
-                    proficiency=skill_data.get("proficiency", "")
-                )
-                session.add(skill)
-        
-        # Commit all changes
-        session.commit()
-        
-        logger.info(f"User {user.id} created/updated successfully")
-        return user.id
-        
-    except Exception as e:
-        logger.error(f"Error creating/updating user: {str(e)}")
-        if session:
-            session.rollback()
-        return None 
\ No newline at end of file
+    sections = {}
+    
+    # Sections missing from resume_data are left unchanged
+    if "experiences" in resume_data:
+        sections["experiences"] = resume_data.get("experiences", [])
+    if "educations" in resume_data:
+        sections["educations"] = resume_data.get("educations", [])
+    if "skills" in resume_data:
+        sections["skills"] = resume_data.get("skills", [])
+    
+    # One transaction: update or insert the user, then one DELETE and one executemany INSERT per section
+    user_id = bulk_save_user(resume_data.get("basic_info", {}), st.session_state.user_id, **sections)
+    if user_id is None:
+        logger.error("Error creating/updating user")
+        return None
+    
+    st.session_state.user_id = user_id
+    
+    # The name may have changed
+    _get_user_name.clear()
+    
+    logger.info("User %s created/updated successfully", user_id)
+    return user_id
@@ -1,16 +1,10 @@
-import os
+import io
 import logging
-import tempfile
-from pathlib import Path
-from datetime import datetime
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-from docx import Document
-from docx.shared import Pt, Inches
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+from functools import lru_cache
+from app.utils.resume_utils import group_skills
+
+# reportlab and python-docx are imported inside the generators so that loading the
+# app does not pay for them until a document is actually built
 
 logger = logging.getLogger(__name__)
 
@@ -36,33 +30,94 @@ def format_resume_as_dict(resume_data):
         "achievements": resume_data.get("achievements", [])
     }
     
+    # Grouped once here so the PDF and DOCX generators share it
+    formatted_data["skill_groups"] = list(group_skills(formatted_data["skills"]).items())
+    
     return formatted_data
 
-def generate_pdf_resume(resume_data, output_path=None):
+@lru_cache(maxsize=None)
+def _get_styles():
+    """Build the PDF paragraph styles once; they are only read during generation."""
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.enums import TA_CENTER
+    
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle(
+        name='Name',
+        fontName='Helvetica-Bold',
+        fontSize=16,
+        alignment=TA_CENTER,
+        spaceAfter=6
+    ))
+    styles.add(ParagraphStyle(
+        name='ContactInfo',
+        fontName='Helvetica',
+        fontSize=9,
+        alignment=TA_CENTER,
+        spaceAfter=12
+    ))
+    styles.add(ParagraphStyle(
+        name='SectionTitle',
+        fontName='Helvetica-Bold',
+        fontSize=11,
+        spaceAfter=6
+    ))
+    styles.add(ParagraphStyle(
+        name='ExperienceTitle',
+        fontName='Helvetica-Bold',
+        fontSize=10,
+        spaceAfter=2
+    ))
+    styles.add(ParagraphStyle(
+        name='ExperienceDetails',
+        fontName='Helvetica-Oblique',
+        fontSize=9,
+        spaceAfter=2
+    ))
+    styles.add(ParagraphStyle(
+        name='BulletItem',
+        fontName='Helvetica',
+        fontSize=9,
+        leftIndent=20,
+        firstLineIndent=-15,
+        spaceAfter=3
+    ))
+    styles.add(ParagraphStyle(
+        name='NormalText',
+        fontName='Helvetica',
+        fontSize=9,
+        spaceAfter=3
+    ))
+    
+    return styles
+
+def generate_pdf_resume(resume_data, output_path=None, formatted_data=None):
     """
     Generate PDF resume from formatted resume data.
     
     Args:
-        resume_data (dict): Formatted resume data
-        output_path (str, optional): Path to save PDF file. If None, a temp file is created.
+        resume_data (dict): Resume data
+        output_path (str, optional): Also save the PDF to this path
+        formatted_data (dict, optional): Result of format_resume_as_dict(resume_data), to
+            share one formatting pass between the PDF and DOCX generators
         
     Returns:
-        str: Path to generated PDF file
+        bytes: Generated PDF file contents (built in memory)
     """
     try:
+        from reportlab.lib.pagesizes import letter
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, ListFlowable, ListItem
+        
         # Format data for template
-        formatted_data = format_resume_as_dict(resume_data)
+        if formatted_data is None:
+            formatted_data = format_resume_as_dict(resume_data)
         
-        # Create temporary file if output path not provided
-        if output_path is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_dir = os.path.join("data", "generated_resumes")
-            os.makedirs(output_dir, exist_ok=True)
-            output_path = os.path.join(output_dir, f"resume_{timestamp}.pdf")
+        # Build the document in memory instead of writing and re-reading a file
+        buffer = io.BytesIO()
         
         # Create PDF document
         doc = SimpleDocTemplate(
-            output_path,
+            buffer,
             pagesize=letter,
             rightMargin=36,
             leftMargin=36,
@@ -70,54 +125,8 @@ def generate_pdf_resume(resume_data, output_path=None):
             bottomMargin=36
         )
         
-        # Create styles
-        styles = getSampleStyleSheet()
-        styles.add(ParagraphStyle(
-            name='Name',
-            fontName='Helvetica-Bold',
-            fontSize=16,
-            alignment=TA_CENTER,
-            spaceAfter=6
-        ))
-        styles.add(ParagraphStyle(
-            name='ContactInfo',
-            fontName='Helvetica',
-            fontSize=9,
-            alignment=TA_CENTER,
-            spaceAfter=12
-        ))
-        styles.add(ParagraphStyle(
-            name='SectionTitle',
-            fontName='Helvetica-Bold',
-            fontSize=11,
-            spaceAfter=6
-        ))
-        styles.add(ParagraphStyle(
-            name='ExperienceTitle',
-            fontName='Helvetica-Bold',
-            fontSize=10,
-            spaceAfter=2
-        ))
-        styles.add(ParagraphStyle(
-            name='ExperienceDetails',
-            fontName='Helvetica-Oblique',
-            fontSize=9,
-            spaceAfter=2
-        ))
-        styles.add(ParagraphStyle(
-            name='BulletItem',
-            fontName='Helvetica',
-            fontSize=9,
-            leftIndent=20,
-            firstLineIndent=-15,
-            spaceAfter=3
-        ))
-        styles.add(ParagraphStyle(
-            name='NormalText',
-            fontName='Helvetica',
-            fontSize=9,
-            spaceAfter=3
-        ))
+        # Shared stylesheet, built once per process
+        styles = _get_styles()
         
         # Build document content
         content = []
@@ -129,12 +138,12 @@ def generate_pdf_resume(resume_data, output_path=None):
         
         # Contact info line
         contact_parts = []
-        if basic_info.get("email"):
-            contact_parts.append(basic_info["email"])
-        if basic_info.get("phone"):
-            contact_parts.append(basic_info["phone"])
-        if basic_info.get("linkedin"):
-            contact_parts.append(basic_info["linkedin"])
+        if (email := basic_info.get("email")):
+            contact_parts.append(email)
+        if (phone := basic_info.get("phone")):
+            contact_parts.append(phone)
+        if (linkedin := basic_info.get("linkedin")):
+            contact_parts.append(linkedin)
         
         contact_info = " | ".join(contact_parts)
         content.append(Paragraph(contact_info, styles["ContactInfo"]))
@@ -156,27 +165,36 @@ def generate_pdf_resume(resume_data, output_path=None):
                 
                 # Dates and location
                 location_parts = []
-                if exp.get("start_date") and exp.get("end_date"):
-                    location_parts.append(f"{exp.get('start_date')} - {exp.get('end_date')}")
-                if exp.get("location"):
-                    location_parts.append(exp.get("location"))
+                start_date = exp.get("start_date")
+                end_date = exp.get("end_date")
+                if start_date and end_date:
+                    location_parts.append(f"{start_date} - {end_date}")
+                if (location := exp.get("location")):
+                    location_parts.append(location)
                 
                 if location_parts:
                     location_line = " | ".join(location_parts)
                     content.append(Paragraph(location_line, styles["ExperienceDetails"]))
                 
                 # Achievements as bullet points
-                if exp.get("description"):
-                    content.append(Paragraph(exp.get("description"), styles["NormalText"]))
+                if (description := exp.get("description")):
+                    content.append(Paragraph(description, styles["NormalText"]))
                 
-                if exp.get("achievements"):
-                    achievements = exp.get("achievements", [])
-                    if isinstance(achievements, str):
-                        achievements = achievements.split("\n")
-                    
-                    for achievement in achievements:
-                        if achievement.strip():
-                            content.append(Paragraph(f"• {achievement.strip()}", styles["BulletItem"]))
+                if (achievements := exp.get("achievements")):
+                    # One list flowable per experience instead of one paragraph per bullet
+                    items = [
+                        ListItem(Paragraph(achievement.strip(), styles["NormalText"]))
+                        for achievement in achievements
+                        if achievement.strip()
+                    ]
+                    if items:
+                        content.append(ListFlowable(
+                            items,
+                            bulletType="bullet",
+                            start="•",
+                            leftIndent=20,
+                            bulletFontSize=9
+                        ))
                 
                 content.append(Spacer(1, 5))
             
@@ -194,15 +212,17 @@ def generate_pdf_resume(resume_data, output_path=None):
                 # Institution and dates
                 institution_parts = []
                 institution_parts.append(edu.get("institution", "Institution"))
-                if edu.get("start_date") and edu.get("end_date"):
-                    institution_parts.append(f"{edu.get('start_date')} - {edu.get('end_date')}")
+                start_date = edu.get("start_date")
+                end_date = edu.get("end_date")
+                if start_date and end_date:
+                    institution_parts.append(f"{start_date} - {end_date}")
                 
                 institution_line = " | ".join(institution_parts)
                 content.append(Paragraph(institution_line, styles["ExperienceDetails"]))
                 
                 # GPA
-                if edu.get("gpa"):
-                    content.append(Paragraph(f"GPA: {edu.get('gpa')}", styles["NormalText"]))
+                if (gpa := edu.get("gpa")):
+                    content.append(Paragraph(f"GPA: {gpa}", styles["NormalText"]))
                 
                 content.append(Spacer(1, 5))
             
@@ -212,16 +232,8 @@ def generate_pdf_resume(resume_data, output_path=None):
         if formatted_data["skills"]:
             content.append(Paragraph("SKILLS", styles["SectionTitle"]))
             
-            # Group skills by category
-            skill_categories = {}
-            for skill in formatted_data["skills"]:
-                category = skill.get("category", "Other")
-                if category not in skill_categories:
-                    skill_categories[category] = []
-                skill_categories[category].append(skill.get("name", ""))
-            
-            # Display skills by category
-            for category, skills in skill_categories.items():
+            # Display skills by category (grouped in format_resume_as_dict)
+            for category, skills in formatted_data["skill_groups"]:
                 content.append(Paragraph(f"{category}: {', '.join(skills)}", styles["NormalText"]))
             
             content.append(Spacer(1, 5))
@@ -233,49 +245,57 @@ def generate_pdf_resume(resume_data, output_path=None):
             for project in formatted_data["projects"]:
                 # Project name
                 project_line = project.get("name", "Project")
-                if project.get("technologies"):
-                    project_line += f" ({project.get('technologies')})"
+                if (technologies := project.get("technologies")):
+                    project_line += f" ({technologies})"
                 content.append(Paragraph(project_line, styles["ExperienceTitle"]))
                 
                 # Description
-                if project.get("description"):
-                    content.append(Paragraph(project.get("description"), styles["NormalText"]))
+                if (description := project.get("description")):
+                    content.append(Paragraph(description, styles["NormalText"]))
                 
                 content.append(Spacer(1, 5))
             
             content.append(Spacer(1, 5))
         
-        # Build and save PDF
+        # Build PDF
         doc.build(content)
+        pdf_bytes = buffer.getvalue()
+        
+        if output_path:
+            with open(output_path, "wb") as f:
+                f.write(pdf_bytes)
         
-        logger.info(f"Generated PDF resume at: {output_path}")
-        return output_path
+        logger.info("Generated PDF resume (%s bytes)", len(pdf_bytes))
+        return pdf_bytes
         
     except Exception as e:
-        logger.error(f"Error generating PDF resume: {str(e)}")
+        logger.error("Error generating PDF resume: %s", e)
         return None
 
-def generate_docx_resume(resume_data, output_path=None):
+def generate_docx_resume(resume_data, output_path=None, formatted_data=None):
     """
     Generate DOCX resume from formatted resume data.
     
     Args:
-        resume_data (dict): Formatted resume data
-        output_path (str, optional): Path to save DOCX file. If None, a temp file is created.
+        resume_data (dict): Resume data
+        output_path (str, optional): Also save the DOCX to this path
+        formatted_data (dict, optional): Result of format_resume_as_dict(resume_data), to
+            share one formatting pass between the PDF and DOCX generators
         
     Returns:
-        str: Path to generated DOCX file
+        bytes: Generated DOCX file contents (built in memory)
     """
     try:
+        from docx import Document
+        from docx.shared import Pt, Inches
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        
         # Format data for template
-        formatted_data = format_resume_as_dict(resume_data)
+        if formatted_data is None:
+            formatted_data = format_resume_as_dict(resume_data)
         
-        # Create temporary file if output path not provided
-        if output_path is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_dir = os.path.join("data", "generated_resumes")
-            os.makedirs(output_dir, exist_ok=True)
-            output_path = os.path.join(output_dir, f"resume_{timestamp}.docx")
+        # Build the document in memory instead of writing and re-reading a file
+        buffer = io.BytesIO()
         
         # Create DOCX document
         doc = Document()
@@ -303,12 +323,12 @@ def generate_docx_resume(resume_data, output_path=None):
         
         # Contact info
         contact_parts = []
-        if basic_info.get("email"):
-            contact_parts.append(basic_info["email"])
-        if basic_info.get("phone"):
-            contact_parts.append(basic_info["phone"])
-        if basic_info.get("linkedin"):
-            contact_parts.append(basic_info["linkedin"])
+        if (email := basic_info.get("email")):
+            contact_parts.append(email)
+        if (phone := basic_info.get("phone")):
+            contact_parts.append(phone)
+        if (linkedin := basic_info.get("linkedin")):
+            contact_parts.append(linkedin)
         
         contact_info = " | ".join(contact_parts)
         contact_paragraph = doc.add_paragraph()
@@ -333,10 +353,12 @@ def generate_docx_resume(resume_data, output_path=None):
                 
                 # Dates and location
                 location_parts = []
-                if exp.get("start_date") and exp.get("end_date"):
-                    location_parts.append(f"{exp.get('start_date')} - {exp.get('end_date')}")
-                if exp.get("location"):
-                    location_parts.append(exp.get("location"))
+                start_date = exp.get("start_date")
+                end_date = exp.get("end_date")
+                if start_date and end_date:
+                    location_parts.append(f"{start_date} - {end_date}")
+                if (location := exp.get("location")):
+                    location_parts.append(location)
                 
                 if location_parts:
                     location_line = " | ".join(location_parts)
@@ -346,15 +368,11 @@ def generate_docx_resume(resume_data, output_path=None):
                     location_run.font.size = Pt(9)
                 
                 # Description
-                if exp.get("description"):
-                    doc.add_paragraph(exp.get("description"))
+                if (description := exp.get("description")):
+                    doc.add_paragraph(description)
                 
                 # Achievements as bullet points
-                if exp.get("achievements"):
-                    achievements = exp.get("achievements", [])
-                    if isinstance(achievements, str):
-                        achievements = achievements.split("\n")
-                    
+                if (achievements := exp.get("achievements")):
                     for achievement in achievements:
                         if achievement.strip():
                             doc.add_paragraph(achievement.strip(), style='List Bullet')
@@ -372,8 +390,10 @@ def generate_docx_resume(resume_data, output_path=None):
                 # Institution and dates
                 institution_parts = []
                 institution_parts.append(edu.get("institution", "Institution"))
-                if edu.get("start_date") and edu.get("end_date"):
-                    institution_parts.append(f"{edu.get('start_date')} - {edu.get('end_date')}")
+                start_date = edu.get("start_date")
+                end_date = edu.get("end_date")
+                if start_date and end_date:
+                    institution_parts.append(f"{start_date} - {end_date}")
                 
                 institution_line = " | ".join(institution_parts)
                 institution_paragraph = doc.add_paragraph()
@@ -382,23 +402,15 @@ def generate_docx_resume(resume_data, output_path=None):
                 institution_run.font.size = Pt(9)
                 
                 # GPA
-                if edu.get("gpa"):
-                    doc.add_paragraph(f"GPA: {edu.get('gpa')}")
+                if (gpa := edu.get("gpa")):
+                    doc.add_paragraph(f"GPA: {gpa}")
         
         # Skills section
         if formatted_data["skills"]:
             doc.add_heading("SKILLS", level=1).bold = True
             
-            # Group skills by category
-            skill_categories = {}
-            for skill in formatted_data["skills"]:
-                category = skill.get("category", "Other")
-                if category not in skill_categories:
-                    skill_categories[category] = []
-                skill_categories[category].append(skill.get("name", ""))
-            
-            # Display skills by category
-            for category, skills in skill_categories.items():
+            # Display skills by category (grouped in format_resume_as_dict)
+            for category, skills in formatted_data["skill_groups"]:
                 doc.add_paragraph(f"{category}: {', '.join(skills)}")
         
         # Projects section
@@ -409,21 +421,26 @@ def generate_docx_resume(resume_data, output_path=None):
                 # Project name
                 project_paragraph = doc.add_paragraph()
                 project_text = project.get("name", "Project")
-                if project.get("technologies"):
-                    project_text += f" ({project.get('technologies')})"
+                if (technologies := project.get("technologies")):
+                    project_text += f" ({technologies})"
                 project_run = project_paragraph.add_run(project_text)
                 project_run.bold = True
                 
                 # Description
-                if project.get("description"):
-                    doc.add_paragraph(project.get("description"))
+                if (description := project.get("description")):
+                    doc.add_paragraph(description)
         
         # Save document
-        doc.save(output_path)
+        doc.save(buffer)
+        docx_bytes = buffer.getvalue()
+        
+        if output_path:
+            with open(output_path, "wb") as f:
+                f.write(docx_bytes)
         
-        logger.info(f"Generated DOCX resume at: {output_path}")
-        return output_path
+        logger.info("Generated DOCX resume (%s bytes)", len(docx_bytes))
+        return docx_bytes
         
     except Exception as e:
-        logger.error(f"Error generating DOCX resume: {str(e)}")
+        logger.error("Error generating DOCX resume: %s", e)
         return None 
\ No newline at end of file
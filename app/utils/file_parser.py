@@ -1,12 +1,19 @@
 import os
+import shutil
 import logging
-import tempfile
-from pathlib import Path
-from PyPDF2 import PdfReader
+import subprocess
+import pypdfium2 as pdfium
 import docx2txt
 
 logger = logging.getLogger(__name__)
 
+# Buffer size used when copying uploads to disk
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Poppler's pdftotext, when installed, is preferred over PDFium for PDF text
+PDFTOTEXT = shutil.which("pdftotext")
+PDFTOTEXT_TIMEOUT = 30
+
 def extract_text_from_pdf(file_path):
     """
     Extract text from PDF file
@@ -17,18 +24,104 @@ def extract_text_from_pdf(file_path):
     Returns:
         str: Extracted text
     """
+    if PDFTOTEXT:
+        try:
+            result = subprocess.run(
+                [PDFTOTEXT, "-enc", "UTF-8", file_path, "-"],
+                check=True,
+                capture_output=True,
+                timeout=PDFTOTEXT_TIMEOUT
+            )
+            # Pages are separated by form feeds; match the PDFium output's newlines
+            text = result.stdout.decode("utf-8", errors="replace").replace("\f", "\n")
+            if text.strip():
+                return text
+            
+            # Image-only pages or unusual encodings; PDFium may still find text
+            logger.warning("pdftotext found no text in %s, trying PDFium", file_path)
+        except Exception as e:
+            # Fall back to PDFium below
+            logger.error("Error extracting text from PDF with pdftotext: %s", e)
+    
     try:
-        text = ""
-        with open(file_path, "rb") as f:
-            pdf_reader = PdfReader(f)
-            for page_num in range(len(pdf_reader.pages)):
-                page = pdf_reader.pages[page_num]
-                text += page.extract_text()
-        return text
+        # PDFium's native text extraction is much faster than a pure-Python parser
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            # Join once instead of growing the string page by page. PDFium ends lines with
+            # CRLF; normalize so the text matches the TXT and pdftotext paths (and their caches)
+            text = "\n".join(page.get_textpage().get_text_range() for page in pdf)
+            return text.replace("\r\n", "\n")
+        finally:
+            pdf.close()
     except Exception as e:
-        logger.error(f"Error extracting text from PDF: {str(e)}")
+        logger.error("Error extracting text from PDF: %s", e)
         return ""
 
+# WordprocessingML tags read by the DOCX extractor, in Clark notation
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_DOCX_PARAGRAPH = _W + "p"
+_DOCX_TEXT = _W + "t"
+_DOCX_BREAKS = {_W + "tab": "\t", _W + "br": "\n", _W + "cr": "\n"}
+# Text boxes are stored twice (DrawingML and a VML fallback); only the first copy is read
+_DOCX_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+def _docx_lines(element, lines):
+    """
+    Append the text of every paragraph under element to lines, in document order.
+    
+    Walks the raw XML so paragraphs inside tables and text boxes are included where
+    they appear instead of being skipped or moved to the end.
+    """
+    for child in element:
+        if child.tag == _DOCX_FALLBACK:
+            continue
+        if child.tag == _DOCX_PARAGRAPH:
+            parts = []
+            _docx_paragraph_text(child, parts, lines)
+            text = "".join(parts).strip()
+            if text:
+                lines.append(text)
+        else:
+            _docx_lines(child, lines)
+
+def _docx_paragraph_text(element, parts, lines):
+    """Collect a paragraph's own text into parts; nested paragraphs go to lines."""
+    for child in element:
+        if child.tag == _DOCX_TEXT:
+            parts.append(child.text or "")
+        elif child.tag in _DOCX_BREAKS:
+            parts.append(_DOCX_BREAKS[child.tag])
+        elif child.tag == _DOCX_FALLBACK:
+            continue
+        elif child.tag == _DOCX_PARAGRAPH:
+            # Text box paragraph anchored in this paragraph
+            _docx_lines([child], lines)
+        else:
+            _docx_paragraph_text(child, parts, lines)
+
+def _docx_headers_footers(section, kind, even_pages):
+    """
+    Get the headers or footers Word shows for a section.
+    
+    First-page and even-page parts can be left in the file after their setting is turned
+    off, so they are only included while titlePg / evenAndOddHeaders is on.
+    
+    Args:
+        section: python-docx Section
+        kind (str): 'header' or 'footer'
+        even_pages (bool): The document's evenAndOddHeaders setting
+        
+    Returns:
+        list: Header or footer objects that are not linked to the previous section
+    """
+    parts = []
+    if section.different_first_page_header_footer:
+        parts.append(getattr(section, f"first_page_{kind}"))
+    parts.append(getattr(section, kind))
+    if even_pages:
+        parts.append(getattr(section, f"even_page_{kind}"))
+    return [part for part in parts if not part.is_linked_to_previous]
+
 def extract_text_from_docx(file_path):
     """
     Extract text from DOCX file
@@ -40,10 +133,37 @@ def extract_text_from_docx(file_path):
         str: Extracted text
     """
     try:
+        # python-docx reads only the document XML; docx2txt also unpacks every image
+        from docx import Document
+        
+        doc = Document(file_path)
+        even_pages = doc.settings.odd_and_even_pages_header_footer
+        lines = []
+        
+        # Many templates put the name and contact details in the page header
+        for section in doc.sections:
+            for header in _docx_headers_footers(section, "header", even_pages):
+                _docx_lines(header._element, lines)
+        
+        _docx_lines(doc.element.body, lines)
+        
+        for section in doc.sections:
+            for footer in _docx_headers_footers(section, "footer", even_pages):
+                _docx_lines(footer._element, lines)
+        
+        if lines:
+            return "\n".join(lines)
+        
+        logger.warning("No text found in DOCX with python-docx, trying docx2txt")
+    except Exception as e:
+        logger.error("Error extracting text from DOCX with python-docx: %s", e)
+    
+    try:
+        # Fallback for files python-docx cannot open or reads as empty
         text = docx2txt.process(file_path)
         return text
     except Exception as e:
-        logger.error(f"Error extracting text from DOCX: {str(e)}")
+        logger.error("Error extracting text from DOCX: %s", e)
         return ""
 
 def extract_text_from_txt(file_path):
@@ -57,13 +177,22 @@ def extract_text_from_txt(file_path):
         str: Extracted text
     """
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            text = f.read()
-        return text
+        # One bytes read and one decode; invalid UTF-8 is replaced instead of failing the upload
+        with open(file_path, "rb") as f:
+            text = f.read().decode("utf-8", errors="replace")
+        # Text mode used to translate Windows line endings
+        return text.replace("\r\n", "\n")
     except Exception as e:
-        logger.error(f"Error extracting text from TXT: {str(e)}")
+        logger.error("Error extracting text from TXT: %s", e)
         return ""
 
+# Text extractors keyed by lowercase file extension; add new formats here
+EXTRACTORS = {
+    ".pdf": extract_text_from_pdf,
+    ".docx": extract_text_from_docx,
+    ".txt": extract_text_from_txt
+}
+
 def save_uploaded_file(uploaded_file, upload_dir="data/uploads"):
     """
     Save uploaded file to disk
@@ -81,13 +210,15 @@ def save_uploaded_file(uploaded_file, upload_dir="data/uploads"):
         
         # Save file
         file_path = os.path.join(upload_dir, uploaded_file.name)
+        # Copy in 64 KiB chunks rather than writing the whole upload in one call
+        uploaded_file.seek(0)
         with open(file_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
+            shutil.copyfileobj(uploaded_file, f, length=UPLOAD_CHUNK_SIZE)
         
-        logger.info(f"Saved uploaded file to {file_path}")
+        logger.info("Saved uploaded file to %s", file_path)
         return file_path
     except Exception as e:
-        logger.error(f"Error saving uploaded file: {str(e)}")
+        logger.error("Error saving uploaded file: %s", e)
         return None
 
 def extract_text_from_file(file_path):
@@ -104,12 +235,9 @@ def extract_text_from_file(file_path):
     file_ext = os.path.splitext(file_path)[1].lower()
     
     # Extract text based on file extension
-    if file_ext == ".pdf":
-        return extract_text_from_pdf(file_path)
-    elif file_ext == ".docx":
-        return extract_text_from_docx(file_path)
-    elif file_ext == ".txt":
-        return extract_text_from_txt(file_path)
-    else:
-        logger.error(f"Unsupported file extension: {file_ext}")
-        return "" 
\ No newline at end of file
+    extractor = EXTRACTORS.get(file_ext)
+    if extractor is None:
+        logger.error("Unsupported file extension: %s", file_ext)
+        return ""
+    
+    return extractor(file_path) 
\ No newline at end of file
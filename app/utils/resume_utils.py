@@ -0,0 +1,17 @@
+from collections import defaultdict
+
+def group_skills(skills):
+    """
+    Group skill names by category, keeping the order categories first appear in.
+    
+    Args:
+        skills (list): Skill dicts with name and category
+        
+    Returns:
+        dict: Category -> list of skill names
+    """
+    skill_categories = defaultdict(list)
+    for skill in skills:
+        skill_categories[skill.get("category", "Other")].append(skill.get("name", ""))
+    
+    return dict(skill_categories)
@@ -1,12 +1,13 @@
 import streamlit as st
 import os
 from dotenv import load_dotenv
-from app.frontend.ui import render_ui
-from app.core.setup import initialize_app
 
-# Load environment variables
+# Load environment variables before importing the app; its modules read settings at import
 load_dotenv()
 
+from app.frontend.ui import render_ui
+from app.core.setup import initialize_app
+
 def main():
     """
     Main function to run the SmartResumeAI application.
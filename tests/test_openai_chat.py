@@ -0,0 +1,77 @@
+import inspect
+from contextlib import contextmanager
+from importlib.metadata import version
+import httpx
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_openai import ChatOpenAI
+from langchain_openai.chat_models.base import _convert_delta_to_message_chunk
+from app.core.openai_chat import PooledChatOpenAI, STREAM_COPIED_FROM
+
+def _make_llm(model="gpt-4o-mini"):
+    """Build an LLM with its own, freshly created HTTP clients."""
+    return PooledChatOpenAI(
+        model_name=model,
+        temperature=0.2,
+        openai_api_key="sk-test",
+        http_client=httpx.Client(),
+        http_async_client=httpx.AsyncClient()
+    )
+
+def test_cache_key_ignores_http_clients():
+    assert _make_llm()._get_llm_string() == _make_llm()._get_llm_string()
+
+def test_cache_key_leaves_out_client_reprs():
+    assert "httpx" not in _make_llm()._get_llm_string()
+
+def test_cache_key_still_depends_on_model():
+    assert _make_llm("gpt-4o-mini")._get_llm_string() != _make_llm("gpt-4-turbo")._get_llm_string()
+
+class _FakeCompletions:
+    """Stands in for client.chat.completions, streaming two deltas and a usage chunk."""
+    
+    def __init__(self):
+        self.params = {}
+    
+    @contextmanager
+    def create(self, **params):
+        self.params = params
+        yield iter([
+            {"choices": [{"delta": {"role": "assistant", "content": "Hel"}, "finish_reason": None}]},
+            {"choices": [{"delta": {"content": "lo"}, "finish_reason": "stop"}]},
+            {"choices": [], "usage": {"prompt_tokens": 7, "completion_tokens": 2, "total_tokens": 9}}
+        ])
+
+class _RecordUsage(BaseCallbackHandler):
+    """Keeps the LLMResult passed to on_llm_end."""
+    
+    def __init__(self):
+        self.response = None
+    
+    def on_llm_end(self, response, **kwargs):
+        self.response = response
+
+def test_stream_reports_token_usage():
+    llm = _make_llm()
+    llm.client = _FakeCompletions()
+    callback = _RecordUsage()
+    
+    chunks = list(llm.stream("hi", config={"callbacks": [callback]}))
+    
+    assert "".join(chunk.content for chunk in chunks) == "Hello"
+    assert llm.client.params["stream_options"] == {"include_usage": True}
+    info = callback.response.generations[0][-1].generation_info
+    assert info["token_usage"]["prompt_tokens"] == 7
+    assert info["token_usage"]["completion_tokens"] == 2
+
+def _parameter_names(func):
+    return list(inspect.signature(func).parameters)
+
+def test_stream_copy_matches_installed_langchain_openai():
+    # PooledChatOpenAI._stream is a copy of ChatOpenAI._stream; compare it with the new
+    # release, then update STREAM_COPIED_FROM and the requirements pin together
+    assert version("langchain-openai") == STREAM_COPIED_FROM
+
+def test_stream_copy_signatures_match_base_class():
+    assert _parameter_names(PooledChatOpenAI._stream) == _parameter_names(ChatOpenAI._stream)
+    assert _parameter_names(ChatOpenAI._create_message_dicts) == ["self", "messages", "stop"]
+    assert _parameter_names(_convert_delta_to_message_chunk) == ["_dict", "default_class"]
@@ -0,0 +1,18 @@
+from app.core.schemas import JobAnalysis, ResumeData
+
+def test_list_for_text_field_is_joined():
+    analysis = JobAnalysis.model_validate({"job_title": "Engineer", "required_experience": ["3+ years Python", "ML"]})
+    assert analysis.required_experience == "3+ years Python\nML"
+    assert analysis.job_title == "Engineer"
+
+def test_string_for_skill_list_is_split_on_commas():
+    analysis = JobAnalysis.model_validate({"required_skills": "Python, SQL"})
+    assert analysis.required_skills == ["Python", "SQL"]
+
+def test_string_for_sentence_list_is_split_on_newlines_only():
+    analysis = JobAnalysis.model_validate({"job_responsibilities": "Build, test and ship\nReview code"})
+    assert analysis.job_responsibilities == ["Build, test and ship", "Review code"]
+
+def test_achievements_string_becomes_list():
+    resume = ResumeData.model_validate({"experiences": [{"achievements": "Led a team, shipped v2\nCut costs\n"}]})
+    assert resume.experiences[0].achievements == ["Led a team, shipped v2", "Cut costs"]